@@ -8,13 +8,17 @@ import pandas as pd
 import numpy as np
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
 
 # Import core utilities
-from utils.data_utils import load_data, load_all_models, create_artist_mapping, get_artist_name
+from utils.data_utils import (
+    load_data, load_all_models, create_artist_mapping, get_artist_name, get_artist_names,
+    UNUSED_TRACK_COLUMNS
+)
 from utils.recommendations import get_recommendations_within_cluster, get_global_recommendations
 from utils.analytics import UserAnalytics
 from utils.formatting import format_duration, get_key_name, get_mode_name
@@ -23,8 +27,8 @@ from utils.styles import initialize_app_styles
 # Import new state management and caching
 from utils.state_manager import state_manager
 from utils.enhanced_cache import (
-    enhanced_cache, cached_search_operation, cached_recommendations,
-    cached_data_processing, get_cache_statistics, cleanup_expired_caches
+    cached_search_operation,
+    get_cache_statistics, cleanup_expired_caches
 )
 from utils.performance_monitor import (
     monitor_performance, track_user_interaction, render_performance_dashboard
@@ -37,11 +41,11 @@ from components.recommendations import render_recommendations_section, render_co
 from components.music_player import render_bottom_player
 from components.search_optimization import (
     create_optimized_search_index,
+    map_first_artist_names,
     vectorized_search,
     get_top_suggestions,
     create_genre_filters,
     apply_advanced_filters,
-    get_autocomplete_suggestions,
     get_available_genres
 )
 
@@ -63,6 +67,95 @@ logger = logging.getLogger(__name__)
 # Initialize custom styles from external CSS file
 initialize_app_styles()
 
+
+# Repeated per-artist string columns held as pandas categoricals
+CATEGORICAL_TRACK_COLUMNS = ('artists_id', 'main_artist_id', 'genres', 'artist_name', 'artist_name_lower')
+
+# Shortest query vectorized_search will match on
+MIN_SEARCH_LENGTH = 2
+
+
+@st.cache_resource(show_spinner=False)
+def load_catalog(tracks_csv: str, artists_csv: str) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, str], pd.DataFrame]:
+    """
+    Load tracks and artists, join artist genres and build the search index.
+    
+    Cached once per process and shared across reruns and sessions, so the CSVs
+    are parsed and the search index is built only on the first run. Held as a
+    resource rather than cache_data so reruns don't unpickle a fresh copy of
+    the catalog; callers must treat the returned frames as read-only.
+    
+    Args:
+        tracks_csv: Path to the tracks CSV
+        artists_csv: Path to the artists CSV
+        
+    Returns:
+        Tuple of (tracks_df, artists_df, artist_mapping, search_index)
+    """
+    # The two CSVs are independent and pandas parses outside the GIL, so read
+    # them concurrently; cold start then costs roughly the slower of the two
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        tracks_future = executor.submit(load_data, tracks_csv, UNUSED_TRACK_COLUMNS)
+        artists_future = executor.submit(load_data, artists_csv)
+        tracks_df, artists_df = tracks_future.result(), artists_future.result()
+    
+    # Extract first artist id for each track (handle string or list)
+    def extract_first_artist_id(artists_id):
+        if isinstance(artists_id, str):
+            # If comma-separated string, take the first
+            return artists_id.split(',')[0].strip()
+        elif isinstance(artists_id, list) and artists_id:
+            return artists_id[0]
+        return None
+    tracks_df['main_artist_id'] = tracks_df['artists_id'].apply(extract_first_artist_id)
+    
+    # Join tracks with artists data for genres
+    tracks_df = tracks_df.merge(
+        artists_df[['id', 'genres']],
+        left_on='main_artist_id',
+        right_on='id',
+        how='left',
+        suffixes=('', '_artist')
+    )
+    
+    # Name of each track's first artist as one hash join against the artists
+    # table; the search index picks this column up instead of building it
+    tracks_df['artist_name'] = map_first_artist_names(tracks_df['artists_id'], artists_df)
+    
+    artist_mapping = create_artist_mapping(artists_df)
+    search_index = create_optimized_search_index(tracks_df, artist_mapping)
+    
+    # Artist ids, names and genres repeat across an artist's tracks; categoricals
+    # store each distinct string once, and .str operations on them only touch
+    # the distinct values
+    for frame in (tracks_df, search_index):
+        for col in CATEGORICAL_TRACK_COLUMNS:
+            if col in frame.columns:
+                frame[col] = frame[col].astype('category')
+    
+    # Full artist names per track, resolved once per distinct artists_id so
+    # cards and recommendations don't re-parse ids per row on every render
+    tracks_df['artist_display_name'] = pd.Series(
+        get_artist_names(tracks_df['artists_id'], artist_mapping), index=tracks_df.index, dtype='category'
+    )
+    
+    return tracks_df, artists_df, artist_mapping, search_index
+
+
+@st.cache_resource(show_spinner=False)
+def get_spotify_client():
+    """
+    Create the Spotify API client once per process.
+    
+    Creating it tests the connection over the network, so doing it per rerun
+    made every widget interaction wait on Spotify. The client only uses app
+    credentials (no per-user auth), so sessions can share it. The import is
+    deferred until here so the module stays optional.
+    """
+    from spotify_api_client import create_spotify_client
+    return create_spotify_client()
+
+
 class SpotifyLikeApp:
     """Spotify-inspired Music Discovery Application"""
     
@@ -107,8 +200,7 @@ class SpotifyLikeApp:
         self.spotify_available = False
         
         try:
-            from spotify_api_client import create_spotify_client
-            self.spotify_client = create_spotify_client()
+            self.spotify_client = get_spotify_client()
             if self.spotify_client:
                 self.spotify_available = True
                 logger.info("Spotify API client initialized successfully")
@@ -119,40 +211,15 @@ class SpotifyLikeApp:
         except Exception as e:
             logger.warning(f"Error initializing Spotify client: {e}")
     
-    @enhanced_cache(ttl=3600)
     @monitor_performance()
     def load_data(self):
-        """Load music data and models with enhanced caching"""
+        """Load music data and models from the process-wide caches"""
         try:
-            # Use cached data processing
-            self.tracks_df = cached_data_processing(self.TRACKS_CSV, 'tracks')
-            self.artists_df = cached_data_processing(self.ARTISTS_CSV, 'artists')
-            
-            # Extract first artist id for each track (handle string or list)
-            def extract_first_artist_id(artists_id):
-                if isinstance(artists_id, str):
-                    # If comma-separated string, take the first
-                    return artists_id.split(',')[0].strip()
-                elif isinstance(artists_id, list) and artists_id:
-                    return artists_id[0]
-                return None
-            self.tracks_df['main_artist_id'] = self.tracks_df['artists_id'].apply(extract_first_artist_id)
-            
-            # Join tracks with artists data for genres
-            self.tracks_df = self.tracks_df.merge(
-                self.artists_df[['id', 'genres']],
-                left_on='main_artist_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_artist')
+            self.tracks_df, self.artists_df, self.artist_mapping, self.search_index = load_catalog(
+                self.TRACKS_CSV, self.ARTISTS_CSV
             )
-            
-            self.artist_mapping = create_artist_mapping(self.artists_df)
             self.models = load_all_models(self.MODEL_PATHS)
             
-            # Initialize optimized search index
-            self.search_index = create_optimized_search_index(self.tracks_df, self.artist_mapping)
-            
             # Initialize featured tracks using state manager
             if not self.state_manager.get_state('featured_tracks'):
                 self.generate_featured_tracks()
@@ -171,17 +238,20 @@ class SpotifyLikeApp:
     def generate_featured_tracks(self):
         """Generate a selection of featured tracks using state manager"""
         if not self.tracks_df.empty:
-            # Select diverse featured tracks
-            popular_tracks = self.tracks_df.nlargest(20, 'popularity')
-            danceable_tracks = self.tracks_df.nlargest(10, 'danceability')
-            energetic_tracks = self.tracks_df.nlargest(10, 'energy')
-            
-            # Combine and shuffle
-            featured_indices = list(set(
-                list(popular_tracks.index[:8]) + 
-                list(danceable_tracks.index[:4]) + 
-                list(energetic_tracks.index[:4])
-            ))
+            def top_positions(column, k):
+                # argpartition finds the k largest in one O(N) pass; only
+                # membership matters since the selection is shuffled below
+                values = self.tracks_df[column].to_numpy(dtype=float, na_value=np.nan)
+                values = np.where(np.isnan(values), -np.inf, values)
+                k = min(k, len(values))
+                return np.argpartition(-values, k - 1)[:k]
+            
+            # Select diverse featured tracks, combine and shuffle
+            featured_indices = np.unique(np.concatenate([
+                top_positions('popularity', 8),
+                top_positions('danceability', 4),
+                top_positions('energy', 4)
+            ])).tolist()
             
             np.random.shuffle(featured_indices)
             self.state_manager.set_state('featured_tracks', featured_indices[:12])
@@ -253,42 +323,33 @@ class SpotifyLikeApp:
             st.error(f"Search error: {e}")
     
     def render_search_section(self):
-        """Render enhanced search section with auto-complete using state manager"""
+        """Render enhanced search section using state manager"""
         st.markdown("### 🔍 Search Music")
         
         # Get current search query from state
         current_query = self.state_manager.get_state('search_query', '')
         
-        # Search input with auto-complete - use callback to avoid session state modification
-        search_query = st.text_input(
-            "Search tracks or artists",
-            value=current_query,
-            placeholder="Type to search...",
-            key="main_search_input",
-            label_visibility="collapsed"
-        )
+        # Search input inside a form so typing doesn't rerun the whole app;
+        # the search runs once on Enter or the Search button. There is no
+        # type-ahead row: the query only reaches the script on submit
+        with st.form("main_search_form", clear_on_submit=False, border=False):
+            input_col, button_col = st.columns([5, 1])
+            with input_col:
+                search_query = st.text_input(
+                    "Search tracks or artists",
+                    value=current_query,
+                    placeholder="Search tracks or artists and press Enter",
+                    key="main_search_input",
+                    label_visibility="collapsed"
+                )
+            with button_col:
+                submitted = st.form_submit_button("Search", use_container_width=True)
         
-        # Only perform search if query changed
-        if search_query != current_query and search_query:
+        # Only perform search if query changed and is long enough to match anything
+        if submitted and search_query != current_query and len(search_query.strip()) >= MIN_SEARCH_LENGTH:
             track_user_interaction('search_input', query=search_query)
             self.perform_search(search_query)
         
-        # Show auto-complete suggestions
-        if search_query and len(search_query) >= 2:
-            suggestions = get_autocomplete_suggestions(search_query, self.search_index)
-            if suggestions:
-                st.markdown("**Suggestions:**")
-                # Display suggestions in one row
-                suggestion_cols = st.columns(len(suggestions))
-                for i, suggestion in enumerate(suggestions):
-                    with suggestion_cols[i]:
-                        if st.button(suggestion, key=f"sugg_{i}_{suggestion}", use_container_width=True):
-                            # Track suggestion click
-                            track_user_interaction('suggestion_click', suggestion=suggestion)
-                            # Use rerun instead of direct state modification
-                            st.query_params.search = suggestion
-                            st.rerun()
-        
         # Advanced filters using state manager
         with st.expander("🔍 Advanced Filters", expanded=False):
             col1, col2 = st.columns(2)
@@ -384,8 +445,7 @@ class SpotifyLikeApp:
                 track_user_interaction('ui_change', view_mode=view_mode, sort_by=sort_by)
                 self.state_manager.update_ui_state(view_mode=view_mode, sort_by=sort_by)
             
-            # Convert results to DataFrame for sorting
-            results_df = pd.DataFrame(search_results)
+            results_df = search_results
             
             # Apply sorting
             if sort_by == "Popularity":
@@ -423,19 +483,12 @@ class SpotifyLikeApp:
         selected_track_idx = self.state_manager.get_state('selected_track_idx')
         
         if selected_track_idx is not None:
-            # Use cached recommendations
             num_recommendations = self.state_manager.get_state('num_recommendations')
             recommendation_type = self.state_manager.get_state('recommendation_type')
             
             try:
-                recommendations = cached_recommendations(
-                    selected_track_idx,
-                    self.tracks_df,
-                    self.models,
-                    num_recommendations,
-                    recommendation_type
-                )
-                
+                # The KNN lookups inside are memoized per (track, k) in session
+                # state and by st.cache_data, so repeat renders skip the search
                 render_recommendations_section(
                     self.tracks_df,
                     self.artist_mapping,
@@ -455,19 +508,12 @@ class SpotifyLikeApp:
         selected_track_idx = self.state_manager.get_state('selected_track_idx')
         
         if selected_track_idx is not None:
-            # Use cached recommendations
             num_recommendations = min(8, self.state_manager.get_state('num_recommendations'))  # Limit to 8 for compact view
             recommendation_type = self.state_manager.get_state('recommendation_type')
             
             try:
-                recommendations = cached_recommendations(
-                    selected_track_idx,
-                    self.tracks_df,
-                    self.models,
-                    num_recommendations,
-                    recommendation_type
-                )
-                
+                # The KNN lookups inside are memoized per (track, k) in session
+                # state and by st.cache_data, so repeat renders skip the search
                 render_compact_recommendations_section(
                     self.tracks_df,
                     self.artist_mapping,
@@ -666,7 +712,14 @@ class SpotifyLikeApp:
 
 def main():
     """Main function to run the Spotify-like Music Discovery App"""
-    app = SpotifyLikeApp()
+    # The app only holds references to the process-wide catalog, models and
+    # client, so build it once per session rather than on every rerun; a
+    # failed load isn't kept so the next rerun retries
+    app = st.session_state.get('spotify_like_app')
+    if app is None:
+        app = SpotifyLikeApp()
+        if not app.tracks_df.empty:
+            st.session_state['spotify_like_app'] = app
     app.run()
 
 
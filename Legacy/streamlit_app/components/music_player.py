@@ -10,7 +10,7 @@ import base64
 from io import BytesIO
 from PIL import Image
 import plotly.graph_objects as go
-from utils.data_utils import get_artist_name
+from utils.data_utils import get_artist_name, get_spotify_track_id
 from utils.formatting import format_duration
 
 # Import get_album_cover from recommendations module
@@ -690,14 +690,7 @@ def get_album_cover_small(track, spotify_client):
     
     try:
         # Get Spotify ID
-        spotify_id = None
-        
-        if 'id' in track and track['id'] and not pd.isna(track['id']):
-            spotify_id = str(track['id']).strip()
-        elif 'uri' in track and track['uri'] and not pd.isna(track['uri']):
-            uri = str(track['uri']).strip()
-            if uri.startswith('spotify:track:'):
-                spotify_id = uri.split(':')[-1]
+        spotify_id = get_spotify_track_id(track)
         
         if spotify_id:
             track_details = spotify_client.get_track_details(spotify_id)
@@ -720,14 +713,7 @@ def get_spotify_url(track, spotify_client):
     
     try:
         # Get Spotify ID
-        spotify_id = None
-        
-        if 'id' in track and track['id'] and not pd.isna(track['id']):
-            spotify_id = str(track['id']).strip()
-        elif 'uri' in track and track['uri'] and not pd.isna(track['uri']):
-            uri = str(track['uri']).strip()
-            if uri.startswith('spotify:track:'):
-                spotify_id = uri.split(':')[-1]
+        spotify_id = get_spotify_track_id(track)
         
         if spotify_id:
             track_details = spotify_client.get_track_details(spotify_id)
@@ -7,7 +7,7 @@ import pandas as pd
 import numpy as np
 import logging
 from typing import Dict, List, Optional, Tuple
-from utils.data_utils import get_artist_name
+from utils.data_utils import get_artist_name, get_artist_names
 from utils.formatting import format_duration
 from utils.recommendations import (
     get_recommendations_within_cluster,
@@ -15,7 +15,7 @@ from utils.recommendations import (
     analyze_recommendations,
     get_artist_diversity
 )
-from .track_grid import render_track_grid
+from .track_grid import render_track_grid, get_enhanced_track_info
 import plotly.graph_objects as go
 
 logger = logging.getLogger(__name__)
@@ -45,18 +45,9 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
         """, unsafe_allow_html=True)
         
         # Get recommendations with similarity scores
-        if recommendation_type == "cluster" and models.get('labels') is not None:
-            distances, indices = get_recommendations_within_cluster(
-                models['knn'], models['embeddings'], 
-                models['labels'], selected_track_idx, 
-                n_neighbors=num_recommendations + 1
-            )
-        else:
-            distances, indices = get_global_recommendations(
-                models['knn'], models['embeddings'], 
-                selected_track_idx, 
-                n_neighbors=num_recommendations + 1
-            )
+        distances, indices = find_recommendation_neighbors(
+            models, selected_track_idx, num_recommendations, recommendation_type
+        )
         
         if distances is None or indices is None:
             st.error("❌ Could not generate recommendations. Please try again.")
@@ -70,16 +61,19 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
         max_distance = max(rec_distances) if len(rec_distances) > 0 else 1
         similarity_scores = [(max_distance - dist) / max_distance for dist in rec_distances]
         
-        # Get recommended tracks with similarity scores
-        recommended_tracks = []
-        for i, (idx, score) in enumerate(zip(rec_indices, similarity_scores)):
-            track = tracks_df.iloc[idx].copy()
-            track['similarity_score'] = score
-            track['recommendation_rank'] = i + 1
-            recommended_tracks.append(track)
+        # Gather the recommended rows once; take() already returns a new frame,
+        # so the score columns are added without a second full copy
+        recommendations_df = tracks_df.take(rec_indices)
+        recommendations_df['similarity_score'] = similarity_scores
+        recommendations_df['recommendation_rank'] = np.arange(1, len(rec_indices) + 1)
+        if 'artist_display_name' not in recommendations_df.columns:
+            # Resolve artist names for all recommendations in one pass
+            recommendations_df['artist_display_name'] = get_artist_names(recommendations_df['artists_id'], artist_mapping)
+        rec_artist_names = recommendations_df['artist_display_name'].tolist()
         
         # Sort by similarity score (highest first)
-        recommended_tracks.sort(key=lambda x: x['similarity_score'], reverse=True)
+        recommendations_df = recommendations_df.sort_values('similarity_score', ascending=False, kind='stable')
+        recommended_tracks = recommendations_df.to_dict('records')
         
         # Display recommendation insights
         st.markdown("### 📊 Recommendation Insights")
@@ -128,7 +122,7 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
         
         with col4:
             # Count unique artists
-            unique_artists = len(set([get_artist_name(track, artist_mapping) for track in recommended_tracks]))
+            unique_artists = len(set(rec_artist_names))
             st.markdown(f"""
             <div style="text-align: center; padding: 16px; background: linear-gradient(135deg, #a8edea, #fed6e3); 
                         border-radius: 8px; color: #333;">
@@ -144,11 +138,13 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
         selected_features = ['energy', 'danceability', 'valence', 'acousticness', 'instrumentalness']
         selected_values = [selected_track.get(f, 0) for f in selected_features]
         
-        # Average values of recommended tracks
-        avg_recommended_values = []
-        for feature in selected_features:
-            values = [track.get(feature, 0) for track in recommended_tracks]
-            avg_recommended_values.append(np.mean(values))
+        # Average values of recommended tracks, aggregated on the frame so the
+        # chart only receives the five means
+        avg_recommended_values = (
+            recommendations_df.reindex(columns=selected_features, fill_value=0)
+            .mean(skipna=False)
+            .tolist()
+        )
         
         # Create radar chart data
         fig = go.Figure()
@@ -192,9 +188,6 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
         # Display recommendations with prominent similarity scores
         st.markdown("### 🎯 Your Recommendations (Ranked by Similarity)")
         
-        # Create DataFrame for easier handling
-        recommendations_df = pd.DataFrame(recommended_tracks)
-        
         # Render recommendations grid with similarity scores
         render_track_grid(
             recommendations_df,
@@ -213,7 +206,7 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
                 col1, col2 = st.columns([3, 1])
                 with col1:
                     st.markdown(f"""
-                    **{i+1}. {track.get('name', 'Unknown')}** by {get_artist_name(track, artist_mapping)}
+                    **{i+1}. {track.get('name', 'Unknown')}** by {track['artist_display_name']}
                     """)
                 with col2:
                     st.markdown(f"""
@@ -238,26 +231,56 @@ def render_recommendations_section(tracks_df, artist_mapping, models, selected_t
         st.error(f"❌ Error generating recommendations: {e}")
         logger.error(f"Recommendation error: {e}")
 
+def find_recommendation_neighbors(models, selected_track_idx, num_recommendations, rec_type):
+    """
+    Find the nearest neighbours of the selected track (the track itself first).
+    
+    Results are kept in session state for the current track, so reruns that
+    only change display settings reuse them instead of repeating the lookup.
+    """
+    memo = st.session_state.get('recommendation_neighbors')
+    if memo is None or memo['track_idx'] != selected_track_idx:
+        memo = {'track_idx': selected_track_idx, 'results': {}}
+        st.session_state['recommendation_neighbors'] = memo
+    
+    key = (num_recommendations, rec_type)
+    if key in memo['results']:
+        return memo['results'][key]
+    
+    if rec_type == "cluster" and models.get('labels') is not None:
+        distances, indices = get_recommendations_within_cluster(
+            models['knn'], models['embeddings'], 
+            models['labels'], selected_track_idx, 
+            n_neighbors=num_recommendations + 1,
+            _cluster_index=models.get('cluster_index'),
+            _hnsw_index=models.get('hnsw'),
+            _sq_norms=models.get('sq_norms')
+        )
+    else:
+        distances, indices = get_global_recommendations(
+            models['knn'], models['embeddings'], 
+            selected_track_idx, 
+            n_neighbors=num_recommendations + 1,
+            _hnsw_index=models.get('hnsw'),
+            _sq_norms=models.get('sq_norms')
+        )
+    
+    # Failures aren't remembered so the next rerun retries
+    if distances is not None and indices is not None:
+        memo['results'][key] = (distances, indices)
+    return distances, indices
+
 def generate_recommendations(tracks_df, models, selected_track_idx, num_recommendations, rec_type):
     """Generate recommendations using the specified method"""
     try:
-        if rec_type == "cluster" and models.get('labels') is not None:
-            distances, indices = get_recommendations_within_cluster(
-                models['knn'], models['embeddings'], 
-                models['labels'], selected_track_idx, 
-                n_neighbors=num_recommendations + 1
-            )
-        else:
-            distances, indices = get_global_recommendations(
-                models['knn'], models['embeddings'], 
-                selected_track_idx, 
-                n_neighbors=num_recommendations + 1
-            )
+        distances, indices = find_recommendation_neighbors(
+            models, selected_track_idx, num_recommendations, rec_type
+        )
         
         if indices is not None:
             # Return recommendations (excluding the input track)
             rec_indices = indices[1:]  # Skip first one (input track)
-            return tracks_df.iloc[rec_indices]
+            return tracks_df.take(rec_indices)
     except Exception as e:
         st.error(f"Error generating recommendations: {e}")
     
@@ -382,7 +405,6 @@ def get_album_cover(track, spotify_client):
         return None
     
     try:
-        from components.track_grid import get_enhanced_track_info
         track_details = get_enhanced_track_info(track, spotify_client)
         
         if track_details:
@@ -401,7 +423,6 @@ def get_spotify_url(track, spotify_client):
         return None
     
     try:
-        from components.track_grid import get_enhanced_track_info
         track_details = get_enhanced_track_info(track, spotify_client)
         
         if track_details:
@@ -426,9 +447,6 @@ def render_recommendation_comparison_chart(current_track, recommendations_df):
     """Render a comparison chart between current track and recommendations"""
     
     try:
-        import plotly.graph_objects as go
-        from plotly.subplots import make_subplots
-        
         # Features to compare
         features = ['energy', 'danceability', 'valence', 'acousticness', 'instrumentalness']
         
@@ -504,18 +522,9 @@ def render_compact_recommendations_section(tracks_df, artist_mapping, models, se
         """, unsafe_allow_html=True)
         
         # Get recommendations
-        if recommendation_type == "cluster" and models.get('labels') is not None:
-            distances, indices = get_recommendations_within_cluster(
-                models['knn'], models['embeddings'], 
-                models['labels'], selected_track_idx, 
-                n_neighbors=num_recommendations + 1
-            )
-        else:
-            distances, indices = get_global_recommendations(
-                models['knn'], models['embeddings'], 
-                selected_track_idx, 
-                n_neighbors=num_recommendations + 1
-            )
+        distances, indices = find_recommendation_neighbors(
+            models, selected_track_idx, num_recommendations, recommendation_type
+        )
         
         if distances is None or indices is None:
             st.error("❌ Could not generate recommendations")
@@ -529,16 +538,19 @@ def render_compact_recommendations_section(tracks_df, artist_mapping, models, se
         max_distance = max(rec_distances) if len(rec_distances) > 0 else 1
         similarity_scores = [(max_distance - dist) / max_distance for dist in rec_distances]
         
-        # Get recommended tracks with similarity scores
-        recommended_tracks = []
-        for i, (idx, score) in enumerate(zip(rec_indices, similarity_scores)):
-            track = tracks_df.iloc[idx].copy()
-            track['similarity_score'] = score
-            track['recommendation_rank'] = i + 1
-            recommended_tracks.append(track)
+        # Gather the recommended rows once; take() already returns a new frame,
+        # so the score columns are added without a second full copy
+        recommendations_df = tracks_df.take(rec_indices)
+        recommendations_df['similarity_score'] = similarity_scores
+        recommendations_df['recommendation_rank'] = np.arange(1, len(rec_indices) + 1)
+        if 'artist_display_name' not in recommendations_df.columns:
+            # Resolve artist names for all recommendations in one pass
+            recommendations_df['artist_display_name'] = get_artist_names(recommendations_df['artists_id'], artist_mapping)
+        rec_artist_names = recommendations_df['artist_display_name'].tolist()
         
         # Sort by similarity score
-        recommended_tracks.sort(key=lambda x: x['similarity_score'], reverse=True)
+        recommendations_df = recommendations_df.sort_values('similarity_score', ascending=False, kind='stable')
+        recommended_tracks = recommendations_df.to_dict('records')
         
         # Display top 3 insights compactly
         col1, col2, col3 = st.columns(3)
@@ -564,7 +576,7 @@ def render_compact_recommendations_section(tracks_df, artist_mapping, models, se
             """, unsafe_allow_html=True)
         
         with col3:
-            unique_artists = len(set([get_artist_name(track, artist_mapping) for track in recommended_tracks]))
+            unique_artists = len(set(rec_artist_names))
             st.markdown(f"""
             <div style="text-align: center; padding: 8px; background: #4ecdc4; 
                         border-radius: 6px; color: white;">
@@ -579,7 +591,7 @@ def render_compact_recommendations_section(tracks_df, artist_mapping, models, se
         for i, track in enumerate(recommended_tracks):
             similarity = track['similarity_score'] * 100
             track_name = track.get('name', 'Unknown')
-            artist_name = get_artist_name(track, artist_mapping)
+            artist_name = track['artist_display_name']
             
             # Truncate long names for compact display
             if len(track_name) > 25:
@@ -2,12 +2,22 @@
 Optimized search utilities for better performance with large datasets.
 """
 
+import itertools
+import weakref
 import pandas as pd
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 import streamlit as st
 from difflib import get_close_matches
 
+try:
+    import pyarrow  # noqa: F401
+    # Arrow-backed strings run substring matching in Arrow's C kernels
+    # instead of a Python call per row
+    SEARCH_TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    SEARCH_TEXT_DTYPE = object
+
 
 @st.cache_data
 def create_optimized_search_index(tracks_df: pd.DataFrame, artist_mapping: Dict[str, str]) -> pd.DataFrame:
@@ -24,16 +34,20 @@ def create_optimized_search_index(tracks_df: pd.DataFrame, artist_mapping: Dict[
     # Create a copy to avoid modifying original
     search_index = tracks_df.copy()
     
-    # Vectorized artist name mapping
-    search_index['artist_name'] = search_index['artists_id'].apply(
-        lambda x: get_artist_name_optimized(x, artist_mapping)
+    # Vectorized artist name mapping, unless the loader already joined it in
+    if 'artist_name' not in search_index.columns:
+        search_index['artist_name'] = map_first_artist_names(search_index['artists_id'], artist_mapping)
+    
+    # Case-folded names are kept so searches don't re-fold every row
+    search_index['name_lower'] = (
+        search_index['name'].fillna('').astype(str).str.casefold().astype(SEARCH_TEXT_DTYPE)
+    )
+    search_index['artist_name_lower'] = (
+        search_index['artist_name'].fillna('').astype(str).str.casefold().astype(SEARCH_TEXT_DTYPE)
     )
     
     # Create combined search text using vectorized operations
-    search_index['search_text'] = (
-        search_index['name'].fillna('').astype(str).str.lower() + ' ' +
-        search_index['artist_name'].fillna('').astype(str).str.lower()
-    )
+    search_index['search_text'] = search_index['name_lower'] + ' ' + search_index['artist_name_lower']
     
     # Create display name
     search_index['display_name'] = (
@@ -43,6 +57,46 @@ def create_optimized_search_index(tracks_df: pd.DataFrame, artist_mapping: Dict[
     return search_index
 
 
+def map_first_artist_names(artists_id: pd.Series,
+                           artist_mapping: Union[Dict[str, str], pd.DataFrame]) -> np.ndarray:
+    """
+    Vectorized equivalent of get_artist_name_optimized over a whole column.
+    
+    Artist ids repeat heavily across tracks, so the column is factorized into
+    codes first (free for a categorical column), the first id is extracted with
+    one string pass over the unique values only, and the names are gathered
+    back by code. Given the artists frame instead of a dict, the lookup is a
+    single hash join on its id column rather than one dict lookup per id.
+    
+    Args:
+        artists_id: Column of artist id strings (single ids or "['id', ...]" lists)
+        artist_mapping: Mapping from artist ID to name, or an artists frame
+            with 'id' and 'name' columns
+        
+    Returns:
+        Artist name per row, "Unknown Artist" where the id is missing or unmapped
+    """
+    codes, uniques = pd.factorize(artists_id)
+    ids = pd.Series(np.asarray(uniques, dtype=object))
+    ids = ids.where(ids.map(type) == str)
+    is_list = ids.str.startswith('[', na=False)
+    # First quoted id of a "['id1', 'id2']" list; plain ids are used as-is
+    first_ids = ids.where(~is_list, ids.str.extract(r"""^\[\s*['"]([^'"]*)['"]""", expand=False))
+    
+    if isinstance(artist_mapping, pd.DataFrame):
+        artists = artist_mapping.dropna(subset=['id', 'name']).drop_duplicates('id')
+        # Unmatched ids get -1, which picks the trailing "Unknown Artist"
+        positions = pd.Index(artists['id']).get_indexer(first_ids.where(first_ids != ''))
+        known = np.append(artists['name'].to_numpy(dtype=object), "Unknown Artist")
+        names = known[positions]
+    else:
+        mapping = artist_mapping or {}
+        names = np.array([mapping.get(aid, "Unknown Artist") if isinstance(aid, str) and aid else "Unknown Artist"
+                          for aid in first_ids], dtype=object)
+    # Missing ids have code -1, which picks the trailing "Unknown Artist"
+    return np.append(names, "Unknown Artist")[codes]
+
+
 def get_artist_name_optimized(artist_id: str, artist_mapping: Dict[str, str]) -> str:
     """Optimized artist name retrieval."""
     if pd.isna(artist_id) or not artist_id or not artist_mapping:
@@ -62,14 +116,35 @@ def get_artist_name_optimized(artist_id: str, artist_mapping: Dict[str, str]) ->
         return "Unknown Artist"
 
 
-@st.cache_data
+# Per-object tokens for search index frames: id() -> (weakref, token). A
+# dead frame's entry is dropped by its weakref callback, so a new frame that
+# reuses the id gets a fresh token instead of the old frame's cached results
+_search_index_tokens = {}
+_search_index_counter = itertools.count()
+
+
+def _search_index_token(search_index: pd.DataFrame) -> int:
+    """Cheap cache key for a search index: its object identity, not its rows."""
+    key = id(search_index)
+    entry = _search_index_tokens.get(key)
+    if entry is None or entry[0]() is not search_index:
+        ref = weakref.ref(search_index, lambda _, key=key: _search_index_tokens.pop(key, None))
+        entry = (ref, next(_search_index_counter))
+        _search_index_tokens[key] = entry
+    return entry[1]
+
+
+# The index is keyed by identity: hashing its ~100k rows cost more than a cache
+# hit saved, but a different (or reloaded) index must not get another's rows.
+# In-place edits to an index therefore aren't seen; build a new one instead
+@st.cache_data(hash_funcs={pd.DataFrame: _search_index_token})
 def vectorized_search(search_term: str, search_index: pd.DataFrame, max_results: int = 50) -> pd.DataFrame:
     """
     Perform vectorized search for better performance.
     
     Args:
         search_term: Search query
-        search_index: Search index DataFrame
+        search_index: Search index DataFrame (cached by identity)
         max_results: Maximum number of results
         
     Returns:
@@ -78,50 +153,60 @@ def vectorized_search(search_term: str, search_index: pd.DataFrame, max_results:
     if not search_term or len(search_term.strip()) < 2:
         return pd.DataFrame()
     
-    search_term = search_term.lower().strip()
+    search_term = search_term.casefold().strip()
     search_words = search_term.split()
     
-    # Vectorized scoring using pandas operations
-    search_index = search_index.copy()
-    
-    # Initialize score column
-    search_index['score'] = 0.0
-    
-    # Exact match scoring (vectorized)
-    exact_match_mask = search_index['search_text'].str.contains(search_term, na=False, regex=False)
-    search_index.loc[exact_match_mask, 'score'] += 100
-    
-    # Song name start matching
-    song_start_mask = search_index['name'].str.lower().str.startswith(search_term, na=False)
-    search_index.loc[song_start_mask, 'score'] += 90
-    
-    # Artist name start matching
-    artist_start_mask = search_index['artist_name'].str.lower().str.startswith(search_term, na=False)
-    search_index.loc[artist_start_mask, 'score'] += 80
-    
-    # Word-by-word matching (vectorized)
+    search_text = search_index['search_text']
+    # Indexes built before the case-folded columns existed fold them on the fly
+    if 'name_lower' in search_index.columns:
+        name_lower = search_index['name_lower']
+        artist_lower = search_index['artist_name_lower']
+    else:
+        name_lower = search_index['name'].str.casefold()
+        artist_lower = search_index['artist_name'].str.casefold()
+    
+    def matches(column, method, text):
+        # Plain substring tests; the query is user text, not a regex
+        kwargs = {'regex': False} if method == 'contains' else {}
+        return getattr(column.str, method)(text, na=False, **kwargs).to_numpy(dtype=bool)
+    
+    # Score into a plain array instead of copying the index and adding a column
+    score = np.zeros(len(search_index))
+    
+    # Word-by-word matching: general, song name and artist name bonuses.
+    # A word has no spaces, so it occurs in "name artist" exactly when it
+    # occurs in the name or the artist; the general match needs no own scan
+    word_in_text = {}
     for word in search_words:
-        # General word match
-        word_match_mask = search_index['search_text'].str.contains(word, na=False, regex=False)
-        search_index.loc[word_match_mask, 'score'] += 25
-        
-        # Song name word match bonus
-        song_word_mask = search_index['name'].str.lower().str.contains(word, na=False, regex=False)
-        search_index.loc[song_word_mask, 'score'] += 15
-        
-        # Artist name word match bonus
-        artist_word_mask = search_index['artist_name'].str.lower().str.contains(word, na=False, regex=False)
-        search_index.loc[artist_word_mask, 'score'] += 10
-    
-    # Popularity bonus (vectorized)
-    popularity_mask = search_index['popularity'].notna()
-    search_index.loc[popularity_mask, 'score'] += search_index.loc[popularity_mask, 'popularity'] * 0.2
-    
-    # Filter results with score > 0 and sort
-    results = search_index[search_index['score'] > 0].copy()
-    results = results.sort_values('score', ascending=False).head(max_results)
-    
-    return results.drop('score', axis=1)
+        in_name = matches(name_lower, 'contains', word)
+        in_artist = matches(artist_lower, 'contains', word)
+        word_in_text[word] = in_name | in_artist
+        score += 25 * word_in_text[word] + 15 * in_name + 10 * in_artist
+    
+    # Exact match (reusing the word scan for one-word queries), song name
+    # start and artist name start
+    if search_term in word_in_text:
+        score += 100 * word_in_text[search_term]
+    else:
+        score += 100 * matches(search_text, 'contains', search_term)
+    score += 90 * matches(name_lower, 'startswith', search_term)
+    score += 80 * matches(artist_lower, 'startswith', search_term)
+    
+    # Popularity bonus (missing popularity adds nothing)
+    popularity = pd.to_numeric(search_index['popularity'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    score += np.nan_to_num(popularity) * 0.2
+    
+    # Keep rows with score > 0, best first
+    hits = np.flatnonzero(score > 0)
+    if len(hits) > max_results:
+        # Partition out the max_results-th best score in O(N) and only sort
+        # rows at or above it; ties at the cut are all kept, so the stable
+        # sort below picks the same rows as a full sort would
+        cutoff = -np.partition(-score[hits], max_results - 1)[max_results - 1]
+        hits = hits[score[hits] >= cutoff]
+    top = hits[np.argsort(-score[hits], kind='stable')][:max_results]
+    
+    return search_index.iloc[top]
 
 
 def get_top_suggestions(search_index: pd.DataFrame, n: int = 10) -> List[str]:
@@ -190,25 +275,24 @@ def apply_advanced_filters(search_index: pd.DataFrame,
     Returns:
         Filtered DataFrame
     """
-    filtered_df = search_index.copy()
+    # Combine all filters into one mask and select once, instead of copying
+    # the input and re-slicing it per filter
+    mask = np.ones(len(search_index), dtype=bool)
     
     # Year filter (vectorized)
-    if year_range and 'year' in filtered_df.columns:
+    if year_range and 'year' in search_index.columns:
         min_year, max_year = year_range
-        year_mask = (filtered_df['year'] >= min_year) & (filtered_df['year'] <= max_year)
-        filtered_df = filtered_df[year_mask]
+        mask &= ((search_index['year'] >= min_year) & (search_index['year'] <= max_year)).to_numpy()
     
     # Popularity filter (vectorized)
-    if popularity_min is not None and 'popularity' in filtered_df.columns:
-        popularity_mask = filtered_df['popularity'] >= popularity_min
-        filtered_df = filtered_df[popularity_mask]
+    if popularity_min is not None and 'popularity' in search_index.columns:
+        mask &= (search_index['popularity'] >= popularity_min).to_numpy()
     
     # Genre filter (vectorized)
-    if genre and 'genre' in filtered_df.columns:
-        genre_mask = filtered_df['genre'].str.contains(genre, na=False, case=False)
-        filtered_df = filtered_df[genre_mask]
+    if genre and 'genre' in search_index.columns:
+        mask &= search_index['genre'].str.contains(genre, na=False, case=False).to_numpy(dtype=bool)
     
-    return filtered_df 
+    return search_index[mask]
 
 
 def get_autocomplete_suggestions(query: str, search_index: pd.DataFrame, max_suggestions: int = 5) -> List[str]:
@@ -300,8 +384,14 @@ def get_available_genres(tracks_df: pd.DataFrame) -> List[str]:
         # If no genres column, return empty list
         return []
     
+    genres_column = tracks_df['genres'].dropna()
+    
+    # Categorical genres: split each distinct genre string once, not once per track
+    if isinstance(genres_column.dtype, pd.CategoricalDtype):
+        genres_column = genres_column.cat.categories
+    
     # Process genres
-    for genres in tracks_df['genres'].dropna():
+    for genres in genres_column:
         if isinstance(genres, str):
             # Handle string format (comma-separated)
             genre_list = [g.strip() for g in genres.split(',')]
@@ -13,6 +13,7 @@ from .search_optimization import (
     apply_advanced_filters,
     get_autocomplete_suggestions
 )
+from utils.enhanced_cache import cached_recommendations
 
 def render_sidebar(app, show_search=True):
     """Render the main sidebar navigation"""
@@ -106,13 +107,13 @@ def render_search_section(app):
         results = vectorized_search(search_query, app.search_index)
         if not results.empty:
             results = apply_advanced_filters(results, filters)
-            st.session_state.search_results = results.to_dict('records')
+            st.session_state.search_results = results
         else:
             st.session_state.search_results = []
         st.rerun()
     
     # Clear search button
-    if st.session_state.search_results:
+    if len(st.session_state.search_results) > 0:
         if st.button("🗑️ Clear Search", use_container_width=True):
             st.session_state.search_results = []
             st.rerun()
@@ -157,9 +158,6 @@ def render_settings_section(app):
         disabled=st.session_state.selected_track_idx is None
     ):
         if st.session_state.selected_track_idx is not None:
-            # Import the cached recommendations function
-            from utils.enhanced_cache import cached_recommendations
-            
             # Trigger recommendations generation
             try:
                 recommendations = cached_recommendations(
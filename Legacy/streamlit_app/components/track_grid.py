@@ -6,7 +6,7 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, List, Optional
 from utils.formatting import format_duration, get_key_name, get_mode_name
-from utils.data_utils import get_artist_name
+from utils.data_utils import get_artist_name, get_spotify_track_id
 from .music_player import get_album_artwork
 
 def render_track_grid(
@@ -108,7 +108,8 @@ def render_enhanced_track_card(track, artist_mapping, spotify_client, grid_id, t
         
         # Track Information Section
         track_name = track.get('name', 'Unknown Track')
-        artist_name = get_artist_name(track, artist_mapping)
+        # Recommendation rows carry names resolved up front
+        artist_name = track.get('artist_display_name') or get_artist_name(track, artist_mapping)
         
         # Truncate long names
         if len(track_name) > 25:
@@ -329,18 +330,8 @@ def get_enhanced_track_info(track, spotify_client):
     if not spotify_client:
         return None
     
-    # Try to get Spotify ID from track data
-    spotify_id = None
-    
-    # Method 1: Direct ID field
-    if 'id' in track and track['id'] and not pd.isna(track['id']):
-        spotify_id = str(track['id']).strip()
-    
-    # Method 2: Extract from URI
-    elif 'uri' in track and track['uri'] and not pd.isna(track['uri']):
-        uri = str(track['uri']).strip()
-        if uri.startswith('spotify:track:'):
-            spotify_id = uri.split(':')[-1]
+    # Spotify ID from the id field, or else the track URI
+    spotify_id = get_spotify_track_id(track)
     
     if spotify_id:
         try:
@@ -3,7 +3,7 @@ Utilities package for Spotify Music Recommendation System
 """
 
 # Core utilities
-from .data_utils import load_data, load_all_models, create_artist_mapping, get_artist_name
+from .data_utils import load_data, load_all_models, create_artist_mapping, get_artist_name, get_artist_names
 from .formatting import format_duration, get_key_name, get_mode_name
 from .styles import initialize_app_styles
 
@@ -56,6 +56,7 @@ __all__ = [
     'load_all_models',
     'create_artist_mapping',
     'get_artist_name',
+    'get_artist_names',
     'format_duration',
     'get_key_name',
     'get_mode_name',
@@ -6,22 +6,48 @@ Handles data loading, caching, and preprocessing.
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
+import joblib
 import os
 import ast
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
+# The pyarrow CSV reader is multi-threaded and much faster on the large tracks
+# file; fall back to pandas' C parser when it isn't installed. pyarrow also
+# enables the Parquet copy load_data keeps next to each CSV
+try:
+    import pyarrow.parquet as pq
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    pq = None
+    CSV_ENGINE = 'c'
 
-@st.cache_data
-def load_data(file_path: str) -> pd.DataFrame:
+# Tracks CSV columns the app never reads; skipping them at parse time avoids
+# materializing e.g. the long available_markets lists for every track
+UNUSED_TRACK_COLUMNS = (
+    'Unnamed: 0', 'analysis_url', 'available_markets', 'country', 'disc_number',
+    'href', 'playlist', 'time_signature', 'track_name_prev', 'track_number'
+)
+
+
+def load_data(file_path: str, exclude_columns: Tuple[str, ...] = ()) -> pd.DataFrame:
     """
-    Load and cache data from CSV file.
+    Load data from CSV file.
+    
+    With pyarrow installed, the parsed columns are also saved next to the CSV
+    as ``<name>.parquet``; later loads read that columnar copy instead of
+    parsing the CSV again. The copy is refreshed when the CSV is newer or
+    lacks a requested column.
+    
+    Not cached here: the app reads the CSVs through its cache_resource'd
+    catalog loader, and an extra st.cache_data layer would keep a second,
+    pickled copy of every frame and unpickle it again on return.
     
     Args:
         file_path (str): Path to the CSV file
+        exclude_columns (Tuple[str, ...]): Columns to skip while parsing, if present
         
     Returns:
         pd.DataFrame: Loaded dataframe
@@ -32,7 +58,27 @@ def load_data(file_path: str) -> pd.DataFrame:
         logger.info(f"Loading data from {file_path}")
         start_time = datetime.now()
         
-        df = pd.read_csv(file_path)
+        # Only the header is read here; pyarrow can't take a callable usecols
+        header = pd.read_csv(file_path, nrows=0).columns
+        usecols = [col for col in header if col not in exclude_columns]
+        
+        parquet_path = Path(file_path).with_suffix('.parquet')
+        if (
+            pq is not None
+            and parquet_path.exists()
+            and parquet_path.stat().st_mtime >= os.path.getmtime(file_path)
+            and set(usecols) <= set(pq.read_schema(parquet_path).names)
+        ):
+            df = pd.read_parquet(parquet_path, columns=usecols)
+        else:
+            df = pd.read_csv(file_path, engine=CSV_ENGINE, usecols=usecols)
+            if pq is not None:
+                try:
+                    df.to_parquet(parquet_path, compression='zstd', index=False)
+                    logger.info(f"Saved columnar copy of {file_path} to {parquet_path}")
+                except OSError as e:
+                    # A read-only data directory only costs the CSV parse on each start
+                    logger.warning(f"Could not save {parquet_path}: {e}")
         
         load_time = (datetime.now() - start_time).total_seconds()
         logger.info(f"Successfully loaded {len(df)} records from {file_path} in {load_time:.2f}s")
@@ -52,10 +98,10 @@ def load_data(file_path: str) -> pd.DataFrame:
 @st.cache_resource
 def load_model(model_path: str) -> Optional[Any]:
     """
-    Load and cache model from pickle file.
+    Load and cache model from a joblib or pickle file.
     
     Args:
-        model_path (str): Path to the pickle file
+        model_path (str): Path to the joblib or pickle file
         
     Returns:
         Optional[Any]: Loaded model or None if error
@@ -66,8 +112,9 @@ def load_model(model_path: str) -> Optional[Any]:
         logger.info(f"Loading model from {model_path}")
         start_time = datetime.now()
         
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        # The pipeline writes models with joblib.dump; joblib.load also reads
+        # plain pickle files from older model directories
+        model = joblib.load(model_path)
         
         load_time = (datetime.now() - start_time).total_seconds()
         logger.info(f"Successfully loaded model from {model_path} in {load_time:.2f}s")
@@ -84,16 +131,98 @@ def load_model(model_path: str) -> Optional[Any]:
         return None
 
 
+def load_mapped_array(model_path: str, dtype: Optional[np.dtype] = None) -> Optional[Any]:
+    """
+    Load a pickled NumPy array as a read-only, memory-mapped array.
+    
+    The unpickled array is saved once next to the pickle as ``<name>.npy``
+    (``<name>.f32.npy`` when converted to float32); later starts map that file
+    instead of unpickling again. The .npy is rebuilt whenever the pickle is
+    newer. Mapping it lets the OS page cache back the array, so it is shared
+    with every other process serving the same models directory.
+    
+    Args:
+        model_path (str): Path to the pickle file
+        dtype (Optional[np.dtype]): Convert the array to this dtype before saving
+        
+    Returns:
+        Optional[Any]: The array, the unpickled object unchanged if it isn't a
+        plain NumPy array, or None if error
+    """
+    try:
+        from logging_config import get_logger
+        logger = get_logger()
+    except:
+        import logging
+        logger = logging.getLogger(__name__)
+    
+    suffix = '.f32.npy' if dtype is not None and np.dtype(dtype) == np.float32 else '.npy'
+    cache_path = Path(model_path).with_suffix(suffix)
+    try:
+        if cache_path.exists() and cache_path.stat().st_mtime >= os.path.getmtime(model_path):
+            logger.info(f"Mapping {cache_path}")
+            return np.load(cache_path, mmap_mode='r')
+        
+        logger.info(f"Loading model from {model_path}")
+        array = joblib.load(model_path)
+    except Exception as e:
+        logger.error(f"Error loading model from {model_path}: {e}")
+        st.error(f"Error loading model from {model_path}: {e}")
+        return None
+    
+    # Object arrays can't be memory-mapped, so they stay plain unpickled objects
+    if not isinstance(array, np.ndarray) or array.dtype.hasobject:
+        return array
+    
+    array = np.ascontiguousarray(array, dtype=dtype)
+    
+    try:
+        np.save(cache_path, array)
+        logger.info(f"Saved {model_path} as {cache_path}")
+        # Map the file just written so the in-memory copy can be freed
+        return np.load(cache_path, mmap_mode='r')
+    except OSError as e:
+        # A read-only models directory only costs the unpickling on each start
+        logger.warning(f"Could not save {model_path} to {cache_path}: {e}")
+    
+    return array
+
+
+def load_embeddings(model_path: str) -> Optional[np.ndarray]:
+    """
+    Load the audio embeddings as a read-only, memory-mapped float32 array.
+    
+    Args:
+        model_path (str): Path to the embeddings pickle file
+        
+    Returns:
+        Optional[np.ndarray]: Embeddings matrix or None if error
+    """
+    # The similarity scan reads the whole matrix per query and is
+    # bandwidth-bound; float32 halves the bytes of the pickled float64
+    # (float16/int8 would have no BLAS kernel and end up slower)
+    return load_mapped_array(model_path, np.float32)
+
+
+# Array artifacts served from a memory-mapped .npy copy instead of the pickle;
+# the fitted models (hdbscan, knn) are regular objects and stay pickled
+MAPPED_ARRAY_MODELS = ('labels', 'song_indices')
+
+
 @st.cache_resource
-def load_all_models(model_paths: Dict[str, str]) -> Optional[Dict[str, Any]]:
+def load_all_models(model_paths: Dict[str, str]) -> Dict[str, Any]:
     """
     Load all available recommendation models.
     
+    The result is a process-wide singleton shared by every session, so the
+    loaded arrays are marked read-only to keep one session from changing
+    another's recommendations.
+    
     Args:
         model_paths (Dict[str, str]): Dictionary mapping model names to file paths
         
     Returns:
-        Optional[Dict[str, Any]]: Dictionary of loaded models or None if error
+        Dict[str, Any]: Dictionary of loaded models (empty if the models directory is missing)
     """
     try:
         from logging_config import get_logger
@@ -109,11 +238,18 @@ def load_all_models(model_paths: Dict[str, str]) -> Optional[Dict[str, Any]]:
     models_dir = Path(list(model_paths.values())[0]).parent
     if not models_dir.exists():
         logger.warning(f"Models directory does not exist: {models_dir}")
-        return None
+        return {}
     
     for model_name, path in model_paths.items():
         if os.path.exists(path):
-            models[model_name] = load_model(path)
+            if model_name == 'embeddings':
+                models[model_name] = load_embeddings(path)
+            elif model_name in MAPPED_ARRAY_MODELS:
+                models[model_name] = load_mapped_array(path)
+            else:
+                models[model_name] = load_model(path)
+            if isinstance(models[model_name], np.ndarray):
+                models[model_name].setflags(write=False)
             if models[model_name] is not None:
                 logger.info(f"Successfully loaded model: {model_name}")
         else:
@@ -121,17 +257,40 @@ def load_all_models(model_paths: Dict[str, str]) -> Optional[Dict[str, Any]]:
             st.warning(f"⚠️ Model {model_name} not found at {path}")
             models[model_name] = None
     
+    # Per-cluster members and embeddings, so cluster recommendations don't
+    # rescan every label on each query
+    if models.get('labels') is not None and models.get('embeddings') is not None:
+        from utils.recommendations import build_cluster_index
+        models['cluster_index'] = build_cluster_index(models['labels'], models['embeddings'])
+    
+    # Squared row norms for the exact matmul scan, computed once here instead of
+    # re-reading the whole matrix for them on every query
+    if models.get('embeddings') is not None:
+        from utils.recommendations import embedding_sq_norms
+        models['sq_norms'] = embedding_sq_norms(models['embeddings'])
+        models['sq_norms'].setflags(write=False)
+    
+    # Approximate index for global recommendations, saved next to the embeddings
+    from utils.recommendations import USE_HNSW_KNN, build_hnsw_index
+    if USE_HNSW_KNN and models.get('embeddings') is not None:
+        index_path = str(Path(model_paths['embeddings']).with_suffix('.hnsw.faiss'))
+        models['hnsw'] = build_hnsw_index(models['embeddings'], index_path, model_paths['embeddings'])
+        if models['hnsw'] is None:
+            logger.warning("USE_HNSW_KNN is set but faiss is not installed; using exact search")
+    
     successful_models = [name for name, model in models.items() if model is not None]
     logger.info(f"Loaded {len(successful_models)} models successfully: {successful_models}")
     
     return models
 
 
-@st.cache_data
 def create_artist_mapping(artists_df: pd.DataFrame) -> Dict[str, str]:
     """
     Create a mapping from artist ID to artist name.
     
+    Built once per process by the app's catalog loader, so it isn't cached
+    here (st.cache_data would hash the whole artists frame on each call).
+    
     Args:
         artists_df (pd.DataFrame): Artists dataframe with 'id' and 'name' columns
         
@@ -234,6 +393,67 @@ def get_artist_name(track_or_artist_id, artist_mapping: Dict[str, str]) -> str:
         return "Unknown Artist"
 
 
+def get_spotify_track_id(track) -> Optional[str]:
+    """
+    Get a track's Spotify ID from its 'id' field, or else its spotify:track: URI.
+    
+    Each field is read once; missing values load from the CSV as NaN floats,
+    so a string check replaces separate membership, truthiness and pd.isna
+    tests.
+    
+    Args:
+        track: Track data (dict/Series)
+        
+    Returns:
+        Optional[str]: Spotify track ID or None if the track has none
+    """
+    track_id = track.get('id')
+    if isinstance(track_id, str) and track_id:
+        return track_id.strip()
+    
+    uri = track.get('uri')
+    if isinstance(uri, str):
+        uri = uri.strip()
+        if uri.startswith('spotify:track:'):
+            return uri.split(':')[-1]
+    
+    return None
+
+
+def get_artist_names(artist_ids: Iterable, artist_mapping: Dict[str, str]) -> List[str]:
+    """
+    Get artist names for many tracks at once.
+    
+    Each distinct artist ID value is parsed and looked up only once, so
+    tracks by the same artists share the work; for a categorical column
+    only its categories are resolved and the names are broadcast through
+    the codes.
+    
+    Args:
+        artist_ids (Iterable): artists_id value of each track
+        artist_mapping (Dict[str, str]): Mapping from ID to name
+        
+    Returns:
+        List[str]: Artist name(s) per track, as get_artist_name would return
+    """
+    if isinstance(getattr(artist_ids, 'dtype', None), pd.CategoricalDtype):
+        # Code -1 (missing) picks the trailing "Unknown Artist"
+        names_by_code = np.array(
+            [get_artist_name(artist_id, artist_mapping) for artist_id in artist_ids.cat.categories]
+            + ["Unknown Artist"],
+            dtype=object
+        )
+        return names_by_code[artist_ids.cat.codes.to_numpy()].tolist()
+    
+    resolved = {}
+    names = []
+    for artist_id in artist_ids:
+        if artist_id not in resolved:
+            resolved[artist_id] = get_artist_name(artist_id, artist_mapping)
+        names.append(resolved[artist_id])
+    return names
+
+
 def format_duration(duration_ms: float) -> str:
     """
     Format duration from milliseconds to MM:SS format.
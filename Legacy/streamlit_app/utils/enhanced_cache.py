@@ -9,10 +9,13 @@ import numpy as np
 import time
 import hashlib
 import pickle
+import warnings
 from typing import Any, Dict, List, Optional, Callable, Tuple
 from functools import wraps
 import logging
 from datetime import datetime, timedelta
+from utils.data_utils import load_data, UNUSED_TRACK_COLUMNS
+from utils.recommendations import get_recommendations_within_cluster, get_global_recommendations
 
 logger = logging.getLogger(__name__)
 
@@ -199,8 +202,10 @@ def enhanced_cache(ttl: int = 3600, max_entries: int = 50):
 
 @enhanced_cache(ttl=1800, max_entries=20)  # 30 minutes
 def cached_search_operation(query: str, search_index: pd.DataFrame, 
-                           filters: Dict[str, Any]) -> List[Dict]:
+                           filters: Dict[str, Any]) -> pd.DataFrame:
     """Cached search operation"""
+    # Imported here: components imports this module, so a module-level import
+    # would be circular
     from components.search_optimization import vectorized_search, apply_advanced_filters
     
     # Perform vectorized search
@@ -214,34 +219,39 @@ def cached_search_operation(query: str, search_index: pd.DataFrame,
         genre=filters.get('genres', [None])[0] if filters.get('genres') else None
     )
     
-    # Convert DataFrame to list of dictionaries
-    return filtered_results.to_dict('records')
+    # Returned as the frame itself: results are rendered from a DataFrame, so
+    # converting to records and back only allocated a dict per row
+    return filtered_results
 
 @enhanced_cache(ttl=3600, max_entries=30)  # 1 hour
 def cached_recommendations(track_idx: int, tracks_df: pd.DataFrame, 
                           _models: Dict, num_recommendations: int, 
                           recommendation_type: str) -> List[Dict]:
     """Cached recommendation generation (models prefixed with _ to avoid hashing)"""
-    from utils.recommendations import get_recommendations_within_cluster, get_global_recommendations
     
     try:
         if recommendation_type == "cluster" and _models.get('labels') is not None:
             distances, indices = get_recommendations_within_cluster(
                 _models['knn'], _models['embeddings'], 
                 _models['labels'], track_idx, 
-                n_neighbors=num_recommendations + 1
+                n_neighbors=num_recommendations + 1,
+                _cluster_index=_models.get('cluster_index'),
+                _hnsw_index=_models.get('hnsw'),
+                _sq_norms=_models.get('sq_norms')
             )
         else:
             distances, indices = get_global_recommendations(
                 _models['knn'], _models['embeddings'], 
                 track_idx, 
-                n_neighbors=num_recommendations + 1
+                n_neighbors=num_recommendations + 1,
+                _hnsw_index=_models.get('hnsw'),
+                _sq_norms=_models.get('sq_norms')
             )
         
         if indices is not None:
             # Return recommendations (excluding the input track)
             rec_indices = indices[1:]  # Skip first one (input track)
-            recommendations_df = tracks_df.iloc[rec_indices]
+            recommendations_df = tracks_df.take(rec_indices)
             return recommendations_df.to_dict('records')
         else:
             return []
@@ -254,10 +264,12 @@ def cached_recommendations(track_idx: int, tracks_df: pd.DataFrame,
 @enhanced_cache(ttl=7200, max_entries=10)  # 2 hours
 def cached_data_processing(data_path: str, processing_type: str) -> pd.DataFrame:
     """Cached data processing operations"""
+    # Share the app's CSV loader (pyarrow parser, Parquet copy) rather than a
+    # second plain read_csv path
     if processing_type == "tracks":
-        return pd.read_csv(data_path)
+        return load_data(data_path, UNUSED_TRACK_COLUMNS)
     elif processing_type == "artists":
-        return pd.read_csv(data_path)
+        return load_data(data_path)
     else:
         raise ValueError(f"Unknown processing type: {processing_type}")
 
@@ -284,20 +296,28 @@ def cached_genre_analysis(tracks_df: pd.DataFrame) -> Dict[str, Any]:
 def cached_audio_features_analysis(tracks_df: pd.DataFrame, 
                                   feature_columns: List[str]) -> Dict[str, Any]:
     """Cached audio features analysis"""
-    analysis = {}
+    features = [feature for feature in feature_columns if feature in tracks_df.columns]
+    if not features:
+        return {}
     
-    for feature in feature_columns:
-        if feature in tracks_df.columns:
-            feature_data = tracks_df[feature].dropna()
-            analysis[feature] = {
-                'mean': float(feature_data.mean()),
-                'std': float(feature_data.std()),
-                'min': float(feature_data.min()),
-                'max': float(feature_data.max()),
-                'median': float(feature_data.median())
-            }
+    # Full-catalog stats in one float matrix with nan-aware column reductions,
+    # instead of a dropna copy and five pandas reductions per feature
+    values = tracks_df[features].to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # All-NaN features come out as NaN, as the pandas reductions did
+        warnings.simplefilter('ignore', RuntimeWarning)
+        stats = {
+            'mean': np.nanmean(values, axis=0),
+            'std': np.nanstd(values, axis=0, ddof=1),
+            'min': np.nanmin(values, axis=0),
+            'max': np.nanmax(values, axis=0),
+            'median': np.nanmedian(values, axis=0)
+        }
     
-    return analysis
+    return {
+        feature: {name: float(column[i]) for name, column in stats.items()}
+        for i, feature in enumerate(features)
+    }
 
 def optimize_dataframe_memory(df: pd.DataFrame) -> pd.DataFrame:
     """Optimize DataFrame memory usage"""
@@ -3,20 +3,252 @@ Recommendation utilities for the Spotify Music Recommendation System.
 Handles KNN-based recommendations and clustering.
 """
 
+import os
 import numpy as np
 import time
-from sklearn.neighbors import NearestNeighbors
 from typing import Tuple, Optional, Any, Dict, List
 import streamlit as st
 from functools import lru_cache
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+# Optional SIMD distance kernels (AVX-512/NEON) for the similarity scan
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Optional JIT for the fused per-cluster distance + top-k loop
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Exact KNN as one BLAS matmul + argpartition; set USE_MATMUL_KNN=false to fall
+# back to sklearn (kneighbors on the trained model, refit per cluster)
+USE_MATMUL_KNN = os.getenv('USE_MATMUL_KNN', 'true').lower() == 'true'
+
+# Serve global recommendations from a Faiss HNSW graph (approximate, sublinear
+# in catalog size) instead of the exact scan; needs faiss installed
+USE_HNSW_KNN = os.getenv('USE_HNSW_KNN', 'false').lower() == 'true'
+
+# HNSW graph degree and build/search beam widths; efSearch trades recall for speed
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+
+# Store the HNSW index's vectors as 8-bit scalar-quantized codes (4x smaller
+# than float32); distances become approximate, rankings nearly unchanged
+HNSW_INT8 = os.getenv('HNSW_INT8', 'false').lower() == 'true'
+
+# Clusters at least this large (e.g. HDBSCAN's noise label) are searched via the
+# HNSW index too, over-fetching this many candidates per neighbour and keeping
+# the cluster's own members; smaller clusters stay on the exact scan
+HNSW_MIN_CLUSTER_SIZE = 20000
+HNSW_CLUSTER_OVERSAMPLE = 8
+
+# Clusters of up to this many embedding values (rows x dims) are searched with
+# the compiled single-pass kernel when numba is installed; above it the BLAS /
+# simsimd scan is faster (crossover measured at about 2000 x 16 float32)
+FUSED_TOP_K_MAX_ELEMENTS = 32_768
+
+
+def _is_euclidean(knn_model: Any) -> bool:
+    """Whether a fitted NearestNeighbors model ranks by plain Euclidean distance"""
+    metric = getattr(knn_model, 'metric', 'euclidean')
+    return metric == 'euclidean' or (metric == 'minkowski' and getattr(knn_model, 'p', 2) == 2)
+
+
+def euclidean_top_k(
+    embeddings: np.ndarray, query: np.ndarray, k: int, sq_norms: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact k nearest rows of an embedding matrix by Euclidean distance.
+    
+    Uses simsimd's squared-Euclidean kernel when it is installed; otherwise
+    expands |e - q|^2 = |e|^2 - 2 e.q + |q|^2 so the whole scan is a single
+    matrix-vector product. The top k are then selected with argpartition
+    instead of sorting every distance.
+    
+    Args:
+        embeddings (np.ndarray): Matrix to search, one row per song
+        query (np.ndarray): Query vector
+        k (int): Number of neighbors to return
+        sq_norms (Optional[np.ndarray]): Precomputed |e|^2 per row (see
+            embedding_sq_norms); computed here when not given
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distances and row indices, nearest first
+    """
+    if simsimd is not None and embeddings.dtype == np.float32:
+        query = np.ascontiguousarray(query, dtype=np.float32)
+        sq_dist = np.asarray(simsimd.cdist(embeddings, query[None, :], metric='sqeuclidean')).ravel()
+    else:
+        if sq_norms is None:
+            sq_norms = embedding_sq_norms(embeddings)
+        sq_dist = embeddings @ query
+        sq_dist *= -2.0
+        sq_dist += sq_norms
+        sq_dist += query @ query
+    
+    k = min(k, len(sq_dist))
+    top = np.argpartition(sq_dist, k - 1)[:k]
+    top = top[np.argsort(sq_dist[top], kind='stable')]
+    
+    # Rounding can leave tiny negatives where the true distance is 0
+    return np.sqrt(np.maximum(sq_dist[top], 0.0)), top
+
+def embedding_sq_norms(embeddings: np.ndarray) -> np.ndarray:
+    """Squared Euclidean norm of every embedding row, for euclidean_top_k"""
+    return np.einsum('ij,ij->i', embeddings, embeddings)
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _fused_top_k(embeddings, query, k):
+        """
+        Exact k nearest rows by Euclidean distance in a single pass.
+        
+        Distances are accumulated row by row into a sorted k-slot buffer, so no
+        distance array is allocated. Ties keep the lower row index first, like
+        the stable sort in euclidean_top_k.
+        """
+        best_sq = np.full(k, np.inf)
+        best_idx = np.full(k, -1, np.int64)
+        for i in range(embeddings.shape[0]):
+            sq = 0.0
+            for j in range(embeddings.shape[1]):
+                diff = embeddings[i, j] - query[j]
+                sq += diff * diff
+            if sq < best_sq[k - 1]:
+                pos = k - 1
+                while pos > 0 and best_sq[pos - 1] > sq:
+                    best_sq[pos] = best_sq[pos - 1]
+                    best_idx[pos] = best_idx[pos - 1]
+                    pos -= 1
+                best_sq[pos] = sq
+                best_idx[pos] = i
+        return np.sqrt(best_sq), best_idx
+else:
+    _fused_top_k = None
+
+def build_hnsw_index(
+    embeddings: np.ndarray, 
+    index_path: Optional[str] = None, 
+    source_path: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Load or build a Faiss HNSW index over the song embeddings.
+    
+    A saved index is reused when it matches the embeddings' shape, the
+    HNSW_INT8 storage setting, and is at least as new as ``source_path``;
+    otherwise the graph is built (a one-off cost of a few seconds per 100k
+    songs) and written to ``index_path``.
+    
+    Args:
+        embeddings (np.ndarray): Song embeddings, one row per song
+        index_path (Optional[str]): Where to persist the index, if anywhere
+        source_path (Optional[str]): File the embeddings were loaded from
+        
+    Returns:
+        Optional[Any]: Faiss index, or None when faiss is not installed
+    """
+    # Imported here so faiss is only loaded when the HNSW path is enabled
+    try:
+        import faiss
+    except ImportError:
+        return None
+    
+    if index_path is not None and os.path.exists(index_path) and (
+        source_path is None or os.path.getmtime(index_path) >= os.path.getmtime(source_path)
+    ):
+        index = faiss.read_index(index_path)
+        if (
+            index.ntotal == len(embeddings)
+            and index.d == embeddings.shape[1]
+            and isinstance(index, faiss.IndexHNSWSQ) == HNSW_INT8
+        ):
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+            return index
+    
+    vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if HNSW_INT8:
+        # Per-dimension min/max ranges are learned from the embeddings
+        index = faiss.IndexHNSWSQ(vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, HNSW_M)
+        index.train(vectors)
+    else:
+        index = faiss.IndexHNSWFlat(vectors.shape[1], HNSW_M)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.add(vectors)
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    
+    if index_path is not None:
+        try:
+            faiss.write_index(index, index_path)
+        except RuntimeError:
+            # Read-only models directory: rebuild on the next start instead
+            pass
+    return index
+
+def _hnsw_cluster_top_k(
+    index: Any, labels: np.ndarray, cluster_id: int, query: np.ndarray, k: int
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Nearest k members of one cluster, found through the global HNSW index.
+    
+    Returns (None, None) when the over-fetched candidates hold fewer than k
+    members of the cluster, so the caller can fall back to the exact scan.
+    """
+    sq_dist, found = index.search(
+        np.ascontiguousarray(query[None, :], dtype=np.float32), k * HNSW_CLUSTER_OVERSAMPLE
+    )
+    sq_dist, found = sq_dist[0], found[0]
+    
+    # Drop Faiss' -1 padding, then keep candidates from the same cluster
+    keep = found >= 0
+    sq_dist, found = sq_dist[keep], found[keep]
+    in_cluster = np.asarray(labels)[found] == cluster_id
+    if np.count_nonzero(in_cluster) < k:
+        return None, None
+    
+    return np.sqrt(np.maximum(sq_dist[in_cluster][:k], 0.0)), found[in_cluster][:k]
+
+def build_cluster_index(labels: np.ndarray, embeddings: np.ndarray) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Group songs by cluster label once, so cluster lookups skip the full label scan.
+    
+    Args:
+        labels (np.ndarray): Cluster label of every song
+        embeddings (np.ndarray): Song embeddings, row-aligned with labels
+        
+    Returns:
+        Dict[int, Tuple[np.ndarray, np.ndarray]]: Cluster label -> (sorted member
+        indices, member embeddings)
+    """
+    labels = np.asarray(labels)
+    # A stable sort keeps members in index order, matching np.where on a mask
+    order = np.argsort(labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    
+    cluster_index = {}
+    for members in np.split(order, boundaries):
+        if len(members):
+            member_embeddings = embeddings[members]
+            # Shared by every session like the arrays it was built from
+            members.setflags(write=False)
+            member_embeddings.setflags(write=False)
+            cluster_index[int(labels[members[0]])] = (members, member_embeddings)
+    return cluster_index
+
+# Keyed only by (song_idx, n_neighbors): the underscore-prefixed model arguments
+# are immutable singletons and are skipped by Streamlit's argument hashing
+@st.cache_data(ttl=3600, max_entries=2048)  # Cache for 1 hour
 def get_recommendations_within_cluster(
     _knn_model: Any, 
     _embeddings: np.ndarray, 
     _labels: np.ndarray, 
     song_idx: int, 
-    n_neighbors: int = 6
+    n_neighbors: int = 6,
+    _cluster_index: Optional[Dict[int, Tuple[np.ndarray, np.ndarray]]] = None,
+    _hnsw_index: Optional[Any] = None,
+    _sq_norms: Optional[np.ndarray] = None
 ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
     """
     Get song recommendations within the same cluster using KNN model.
@@ -28,6 +260,10 @@ def get_recommendations_within_cluster(
         _labels (np.ndarray): Cluster labels (prefixed with _ to avoid hashing)
         song_idx (int): Index of the selected song
         n_neighbors (int): Number of neighbors to find
+        _cluster_index: Optional prebuilt lookup from build_cluster_index
+        _hnsw_index: Optional Faiss index from build_hnsw_index; used for
+            clusters of at least HNSW_MIN_CLUSTER_SIZE songs
+        _sq_norms: Optional squared row norms of the embeddings from model load
         
     Returns:
         Tuple[Optional[np.ndarray], Optional[np.ndarray]]: Distances and indices of recommendations
@@ -54,8 +290,12 @@ def get_recommendations_within_cluster(
         logger.debug(f"Song {song_idx} belongs to cluster {cluster_id}")
         
         # Find all songs in the same cluster
-        cluster_mask = np.array(_labels) == cluster_id
-        cluster_indices = np.where(cluster_mask)[0]
+        if _cluster_index is not None:
+            cluster_indices, cluster_embeddings = _cluster_index[int(cluster_id)]
+        else:
+            cluster_mask = np.array(_labels) == cluster_id
+            cluster_indices = np.where(cluster_mask)[0]
+            cluster_embeddings = _embeddings[cluster_mask]
         
         # If cluster has fewer songs than requested neighbors, adjust
         n_neighbors = min(n_neighbors, len(cluster_indices))
@@ -65,24 +305,44 @@ def get_recommendations_within_cluster(
             logger.warning(f"Cluster {cluster_id} has too few songs for recommendations")
             return None, None
         
-        # Get embeddings for songs in the same cluster
-        cluster_embeddings = _embeddings[cluster_mask]
+        # Find position of selected song within cluster (members are sorted)
+        song_cluster_idx = np.searchsorted(cluster_indices, song_idx)
         
-        # Create KNN model for this cluster
-        cluster_knn = NearestNeighbors(n_neighbors=n_neighbors, metric='euclidean')
-        cluster_knn.fit(cluster_embeddings)
+        distances, global_indices = None, None
+        if _hnsw_index is not None and len(cluster_indices) >= HNSW_MIN_CLUSTER_SIZE:
+            distances, global_indices = _hnsw_cluster_top_k(
+                _hnsw_index, _labels, cluster_id, _embeddings[song_idx], n_neighbors
+            )
         
-        # Find position of selected song within cluster
-        song_cluster_idx = np.where(cluster_indices == song_idx)[0][0]
+        if global_indices is None:
+            if USE_MATMUL_KNN and _fused_top_k is not None and cluster_embeddings.size <= FUSED_TOP_K_MAX_ELEMENTS:
+                # Small clusters: call overhead dominates the matmul, and one
+                # compiled pass avoids the temporaries
+                distances, local_indices = _fused_top_k(
+                    np.asarray(cluster_embeddings), np.asarray(cluster_embeddings[song_cluster_idx]), n_neighbors
+                )
+            elif USE_MATMUL_KNN:
+                distances, local_indices = euclidean_top_k(
+                    cluster_embeddings, cluster_embeddings[song_cluster_idx], n_neighbors,
+                    None if _sq_norms is None else _sq_norms[cluster_indices]
+                )
+            else:
+                # sklearn is only needed on this fallback path
+                from sklearn.neighbors import NearestNeighbors
+                
+                # Create KNN model for this cluster
+                cluster_knn = NearestNeighbors(n_neighbors=n_neighbors, metric='euclidean')
+                cluster_knn.fit(cluster_embeddings)
+                
+                # Get recommendations within cluster
+                distances, local_indices = cluster_knn.kneighbors(
+                    cluster_embeddings[song_cluster_idx].reshape(1, -1), 
+                    n_neighbors=n_neighbors
+                )
+                distances, local_indices = distances[0], local_indices[0]
         
-        # Get recommendations within cluster
-        distances, local_indices = cluster_knn.kneighbors(
-            cluster_embeddings[song_cluster_idx].reshape(1, -1), 
-            n_neighbors=n_neighbors
-        )
-        
-        # Convert local indices back to global indices
-        global_indices = cluster_indices[local_indices[0]]
+            # Convert local indices back to global indices
+            global_indices = cluster_indices[local_indices]
         
         processing_time = time.time() - start_time
         logger.info(f"Generated {len(global_indices)} cluster recommendations for song {song_idx}")
@@ -100,7 +360,7 @@ def get_recommendations_within_cluster(
             }
         )
         
-        return distances[0], global_indices
+        return distances, global_indices
         
     except Exception as e:
         processing_time = time.time() - start_time
@@ -111,12 +371,14 @@ def get_recommendations_within_cluster(
         })
         return None, None
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+@st.cache_data(ttl=3600, max_entries=2048)  # Cache for 1 hour
 def get_global_recommendations(
     _knn_model: Any, 
     _embeddings: np.ndarray, 
     song_idx: int, 
-    n_neighbors: int = 6
+    n_neighbors: int = 6,
+    _hnsw_index: Optional[Any] = None,
+    _sq_norms: Optional[np.ndarray] = None
 ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
     """
     Get song recommendations from entire dataset using pre-trained KNN model.
@@ -127,6 +389,9 @@ def get_global_recommendations(
         _embeddings (np.ndarray): Song embeddings (prefixed with _ to avoid hashing)
         song_idx (int): Index of the selected song
         n_neighbors (int): Number of neighbors to find
+        _hnsw_index: Optional Faiss index from build_hnsw_index; used when given
+        _sq_norms: Optional squared row norms of the embeddings from model load,
+            so the exact scan doesn't recompute them per query
         
     Returns:
         Tuple[Optional[np.ndarray], Optional[np.ndarray]]: Distances and indices of recommendations
@@ -151,17 +416,29 @@ def get_global_recommendations(
         # Get the embedding for the selected song
         song_embedding = _embeddings[song_idx].reshape(1, -1)
         
-        # Find nearest neighbors
-        distances, indices = _knn_model.kneighbors(song_embedding, n_neighbors=n_neighbors)
+        # Find nearest neighbors; the trained model indexes the same embeddings,
+        # so an exact matmul scan returns the same neighbors for Euclidean KNN
+        if _hnsw_index is not None:
+            sq_dist, indices = _hnsw_index.search(
+                np.ascontiguousarray(song_embedding, dtype=np.float32), n_neighbors
+            )
+            # Faiss pads with -1 when the graph walk finds fewer than k songs
+            found = indices[0] >= 0
+            distances, indices = np.sqrt(np.maximum(sq_dist[0][found], 0.0)), indices[0][found]
+        elif USE_MATMUL_KNN and _is_euclidean(_knn_model):
+            distances, indices = euclidean_top_k(_embeddings, song_embedding[0], n_neighbors, _sq_norms)
+        else:
+            distances, indices = _knn_model.kneighbors(song_embedding, n_neighbors=n_neighbors)
+            distances, indices = distances[0], indices[0]
         
         processing_time = time.time() - start_time
-        logger.info(f"Generated {len(indices[0])} global recommendations for song {song_idx}")
+        logger.info(f"Generated {len(indices)} global recommendations for song {song_idx}")
         
         # Log performance metrics
         log_recommendation_generation(
             method="global_knn",
             song_idx=song_idx,
-            num_recommendations=len(indices[0]),
+            num_recommendations=len(indices),
             processing_time=processing_time,
             details={
                 'embedding_dimensions': song_embedding.shape[1],
@@ -169,7 +446,7 @@ def get_global_recommendations(
             }
         )
         
-        return distances[0], indices[0]
+        return distances, indices
         
     except Exception as e:
         processing_time = time.time() - start_time
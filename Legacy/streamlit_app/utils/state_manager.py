@@ -105,7 +105,7 @@ class AppStateManager:
         except Exception as e:
             logger.error(f"Error updating track state: {e}")
     
-    def update_search_state(self, query: str, results: List[Dict], 
+    def update_search_state(self, query: str, results: pd.DataFrame, 
                            suggestions: Optional[List[str]] = None):
         """Update search-related state safely"""
         try:
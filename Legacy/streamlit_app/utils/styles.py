@@ -5,6 +5,7 @@ Utility module for loading and applying CSS styles to the Streamlit app.
 import streamlit as st
 import os
 from pathlib import Path
+from typing import Optional
 
 
 def load_css(css_file_path: str) -> str:
@@ -44,6 +45,26 @@ def apply_custom_css(css_content: str) -> None:
         """, unsafe_allow_html=True)
 
 
+@st.cache_data(show_spinner=False)
+def build_style_block(css_file_path: str, mtime: Optional[float] = None) -> str:
+    """
+    Read a CSS file and wrap it in a <style> tag.
+    
+    Cached per path and modification time, so reruns reuse the string
+    instead of re-reading the stylesheet, while edits to the file still
+    show up on the next rerun.
+    
+    Args:
+        css_file_path (str): Path to the CSS file
+        mtime (Optional[float]): Modification time of the file, part of the cache key
+        
+    Returns:
+        str: <style> block, or an empty string if the file couldn't be read
+    """
+    css_content = load_css(css_file_path)
+    return f"<style>\n{css_content}\n</style>" if css_content else ""
+
+
 def load_and_apply_css(css_file_path: str) -> None:
     """
     Load CSS from file and apply it to the Streamlit app.
@@ -51,8 +72,11 @@ def load_and_apply_css(css_file_path: str) -> None:
     Args:
         css_file_path (str): Path to the CSS file
     """
-    css_content = load_css(css_file_path)
-    apply_custom_css(css_content)
+    css_path = Path(css_file_path)
+    mtime = css_path.stat().st_mtime if css_path.exists() else None
+    style_block = build_style_block(css_file_path, mtime)
+    if style_block:
+        st.markdown(style_block, unsafe_allow_html=True)
 
 
 def get_css_path(filename: str = "styles.css") -> str:
@@ -2,6 +2,12 @@ import pytest
 from unittest.mock import MagicMock, patch
 import pandas as pd
 import numpy as np
+import os
+import sys
+
+# The app imports its packages as top-level `utils` / `components` (it runs
+# from streamlit_app/), so make them importable for the tests too
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app'))
 
 @pytest.fixture(autouse=True)
 def patch_streamlit(monkeypatch):
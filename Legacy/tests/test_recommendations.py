@@ -1,11 +1,14 @@
 import pytest
 import numpy as np
+from streamlit_app.utils import recommendations
 from streamlit_app.utils.recommendations import get_recommendations_within_cluster, get_global_recommendations
 
+
 class DummyKNN:
     def kneighbors(self, X, n_neighbors=2):
         return np.array([[0.1, 0.2]]), np.array([[0, 1]])
 
+
 def test_get_recommendations_within_cluster(sample_embeddings):
     knn = DummyKNN()
     labels = np.array([0, 0])
@@ -14,9 +17,56 @@ def test_get_recommendations_within_cluster(sample_embeddings):
     assert indices is not None
     assert len(indices) == 2
 
+
 def test_get_global_recommendations(sample_embeddings):
     knn = DummyKNN()
     distances, indices = get_global_recommendations(knn, sample_embeddings, 0, n_neighbors=2)
     assert distances is not None
     assert indices is not None
-    assert len(indices) == 2 
\ No newline at end of file
+    assert len(indices) == 2
+
+
+@pytest.fixture
+def knn_embeddings():
+    rng = np.random.default_rng(0)
+    return rng.random((200, 8), dtype=np.float32)
+
+
+def _sklearn_neighbors(embeddings, query_idx, k):
+    from sklearn.neighbors import NearestNeighbors
+    distances, indices = NearestNeighbors(n_neighbors=k).fit(embeddings).kneighbors(embeddings[query_idx:query_idx + 1])
+    return distances[0], indices[0]
+
+
+@pytest.mark.parametrize('use_simsimd', [True, False])
+def test_euclidean_top_k_matches_nearest_neighbors(knn_embeddings, monkeypatch, use_simsimd):
+    if use_simsimd:
+        pytest.importorskip('simsimd')
+    else:
+        monkeypatch.setattr(recommendations, 'simsimd', None)
+    for query_idx in (0, 57, 199):
+        expected_distances, expected_indices = _sklearn_neighbors(knn_embeddings, query_idx, 6)
+        distances, indices = recommendations.euclidean_top_k(knn_embeddings, knn_embeddings[query_idx], 6)
+        np.testing.assert_array_equal(indices, expected_indices)
+        # The float32 |e|^2 - 2e.q + |q|^2 expansion loses ~1e-7 to cancellation,
+        # which the square root turns into ~5e-4 near zero
+        np.testing.assert_allclose(distances, expected_distances, rtol=1e-5, atol=1e-6 if use_simsimd else 1e-3)
+
+
+def test_euclidean_top_k_with_precomputed_norms(knn_embeddings, monkeypatch):
+    monkeypatch.setattr(recommendations, 'simsimd', None)
+    sq_norms = recommendations.embedding_sq_norms(knn_embeddings)
+    expected = recommendations.euclidean_top_k(knn_embeddings, knn_embeddings[57], 6)
+    actual = recommendations.euclidean_top_k(knn_embeddings, knn_embeddings[57], 6, sq_norms)
+    np.testing.assert_array_equal(actual[1], expected[1])
+    np.testing.assert_array_equal(actual[0], expected[0])
+
+
+def test_fused_top_k_matches_nearest_neighbors(knn_embeddings):
+    if recommendations._fused_top_k is None:
+        pytest.skip('numba is not installed')
+    for query_idx in (0, 57, 199):
+        expected_distances, expected_indices = _sklearn_neighbors(knn_embeddings, query_idx, 6)
+        distances, indices = recommendations._fused_top_k(knn_embeddings, knn_embeddings[query_idx], 6)
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_allclose(distances, expected_distances, rtol=1e-5, atol=1e-6)
@@ -44,12 +44,12 @@ class CompatibleLyricsSimilarityModel:
             svd_path = os.path.join(self.models_dir, f"lyrics_svd_model_{self.model_name}.pkl")
             knn_path = os.path.join(self.models_dir, f"lyrics_knn_model_{self.model_name}.pkl")
 
-            self.svd_model = joblib.load(svd_path)
-            self.model = joblib.load(knn_path)
+            self.svd_model = joblib.load(svd_path, mmap_mode='r')
+            self.model = joblib.load(knn_path, mmap_mode='r')
         else:
             # Load direct model
             model_path = os.path.join(self.models_dir, f"lyrics_similarity_model_{self.model_name}.pkl")
-            self.model = joblib.load(model_path)
+            self.model = joblib.load(model_path, mmap_mode='r')
 
         # Load metadata
         metadata_path = os.path.join(self.models_dir, "lyrics_training_metadata.pkl")
@@ -75,7 +75,6 @@ class CompatibleLyricsSimilarityModel:
         import nltk
         from nltk.corpus import stopwords
         from nltk.stem import WordNetLemmatizer
-        from nltk.tokenize import word_tokenize
 
         if not text:
             return ""
@@ -88,12 +87,12 @@ class CompatibleLyricsSimilarityModel:
 
         # Tokenize and process based on training method
         try:
-            tokens = word_tokenize(text)
             lemmatizer = WordNetLemmatizer()
-            stop_words = set(stopwords.words('english'))
+            stop_words = frozenset(stopwords.words('english'))
 
-            processed_tokens = [lemmatizer.lemmatize(token) for token in tokens 
-                              if token not in stop_words and len(token) > 2]
+            # Text is already reduced to [a-z ], so a split is enough
+            processed_tokens = [lemmatizer.lemmatize(token) for token in text.split()
+                              if len(token) > 2 and token not in stop_words]
 
             return ' '.join(processed_tokens)
         except:
@@ -121,7 +120,7 @@ class CompatibleLyricsSimilarityModel:
             'has_svd': self.config.get('has_svd', False),
             'sklearn_version': self.config.get('sklearn_version'),
             'parameters': self.config.get('model_params', {}),
-            'vocabulary_size': len(self.vectorizer.vocabulary_) if self.vectorizer else 0
+            'vocabulary_size': self.metadata.get('vocabulary_size', 0) if self.metadata else 0
         }
 
 # Example usage:
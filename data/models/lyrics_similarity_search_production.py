@@ -3,58 +3,151 @@ Production-ready lyrics similarity search function
 Generated automatically by model pipeline
 """
 
+import os
 import pandas as pd
 import numpy as np
 import joblib
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
+from functools import lru_cache
+from multiprocessing import Pool
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
 
-# Initialize NLTK components
+# Optional FAISS index for the SVD model's dense embeddings
 try:
+    import faiss
+except ImportError:
+    faiss = None
+
+@lru_cache(maxsize=1)
+def _nlp():
+    """Load the NLTK lemmatizer and stop words on first use"""
+    # Deferred so importing this module stays cheap; the corpora are expected
+    # to be installed ahead of time (python -m nltk.downloader stopwords wordnet)
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    
     lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words('english'))
-except:
-    print("Warning: NLTK data not available. Please run: nltk.download(['punkt', 'stopwords', 'wordnet'])")
+    stop_words = frozenset(stopwords.words('english'))
+    # Lyrics reuse a small vocabulary, so most lemma lookups are repeats
+    return lru_cache(maxsize=50_000)(lemmatizer.lemmatize), stop_words
+
+# Cleaning patterns, compiled once at import
+_NON_ALPHA_RE = re.compile(r'[^a-z\s]')
+
+# Batches at least this large are preprocessed across all cores
+PARALLEL_PREPROCESS_MIN = 10_000
+PREPROCESS_CHUNKSIZE = 2000
 
 # Load model components (update paths as needed)
 MODEL_DIR = "../../data/models"
 vectorizer = joblib.load(f"{MODEL_DIR}/lyrics_tfidf_vectorizer.pkl")
 training_metadata = joblib.load(f"{MODEL_DIR}/lyrics_training_metadata.pkl")
+song_ids = training_metadata['ids']
+song_names = training_metadata['names']
+song_artists = training_metadata['artists']
 
 # Load best model: knn_cosine
+model_type = None
+faiss_index = None
 try:
+    # The query path (vectorizer -> [svd ->] knn) is assembled from the saved
+    # parts rather than pickled again as a whole
     if "knn_cosine" == "svd_knn":
-        svd_model = joblib.load(f"{MODEL_DIR}/lyrics_svd_model_knn_cosine.pkl")
-        similarity_model = joblib.load(f"{MODEL_DIR}/lyrics_knn_model_knn_cosine.pkl")
-        model_type = "svd_knn"
+        query_steps = [
+            ('svd', joblib.load(f"{MODEL_DIR}/lyrics_svd_model_knn_cosine.pkl", mmap_mode='r')),
+            ('knn', joblib.load(f"{MODEL_DIR}/lyrics_knn_model_knn_cosine.pkl", mmap_mode='r'))
+        ]
     else:
-        similarity_model = joblib.load(f"{MODEL_DIR}/lyrics_similarity_model_knn_cosine.pkl")
-        model_type = "knn"
-        svd_model = None
+        query_steps = [('knn', joblib.load(f"{MODEL_DIR}/lyrics_similarity_model_knn_cosine.pkl", mmap_mode='r'))]
+    query_pipeline = Pipeline([('tfidf', vectorizer)] + query_steps)
+    
+    # Every step but the KNN turns text into query vectors
+    query_transform = query_pipeline[:-1]
+    similarity_model = query_pipeline.named_steps['knn']
+    model_type = "svd_knn" if 'svd' in query_pipeline.named_steps else "knn"
+    
+    faiss_path = f"{MODEL_DIR}/lyrics_faiss_index_knn_cosine.faiss"
+    if model_type == "svd_knn" and faiss is not None and os.path.exists(faiss_path):
+        faiss_index = faiss.read_index(faiss_path)
+        if hasattr(faiss_index, 'hnsw'):
+            faiss_index.hnsw.efSearch = 64
 except Exception as e:
     print(f"Error loading model: {e}")
     similarity_model = None
 
+def _load_array(name):
+    """Memory-map a raw training array; pages are read only as searches touch them"""
+    return np.load(f"{MODEL_DIR}/{name}.npy", mmap_mode='r')
+
+# Unit-norm training TF-IDF rows; with them cosine top-k is one sparse product.
+# The postings arrays are the CSC layout of the same matrix: entries
+# postings_indptr[j]:postings_indptr[j + 1] of postings_indices are the rows
+# containing term j
+try:
+    tfidf_indptr = _load_array("lyrics_tfidf_matrix_indptr")
+    tfidf_matrix = sp.csr_matrix(
+        (_load_array("lyrics_tfidf_matrix_data"), _load_array("lyrics_tfidf_matrix_indices"), tfidf_indptr),
+        shape=(len(tfidf_indptr) - 1, training_metadata['tfidf_features'])
+    )
+    postings_indices = _load_array("lyrics_tfidf_postings_indices")
+    postings_indptr = _load_array("lyrics_tfidf_postings_indptr")
+except Exception:
+    tfidf_matrix = None
+use_dot_product = (
+    model_type == "knn" and tfidf_matrix is not None
+    and getattr(similarity_model, 'metric', None) == 'cosine'
+)
+
+def _cosine_kneighbors(query_vectors, k):
+    """Top-k cosine neighbours of unit-norm query rows, as (distances, indices)
+    
+    Rows sharing no term with a query have zero similarity, so only the union
+    of the query terms' posting lists is scored.
+    """
+    n_rows = tfidf_matrix.shape[0]
+    k = min(k, n_rows)
+    distances = np.empty((query_vectors.shape[0], k))
+    indices = np.empty((query_vectors.shape[0], k), dtype=np.intp)
+    
+    for row in range(query_vectors.shape[0]):
+        query = query_vectors[row]
+        postings = [
+            postings_indices[postings_indptr[j]:postings_indptr[j + 1]]
+            for j in query.indices
+        ]
+        candidates = np.unique(np.concatenate(postings)) if postings else np.empty(0, dtype=np.intp)
+        if len(candidates) < k:
+            # Too few overlapping rows to fill k; score everything like kneighbors does
+            candidates = np.arange(n_rows)
+        
+        sims = (tfidf_matrix[candidates] @ query.T).toarray().ravel()
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        indices[row] = candidates[top]
+        distances[row] = 1 - sims[top]
+    
+    return distances, indices
+
+@lru_cache(maxsize=131072)
 def preprocess_lyrics(text):
     """Preprocess lyrics using the same method as training"""
-    if pd.isna(text):
+    # Nothing shorter than 3 characters can yield a kept token
+    if not isinstance(text, str) or len(text) < 3:
         return ""
     
-    # Convert to lowercase and clean
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
+    # Convert to lowercase and clean, unless the text is already lowercase
+    # ASCII letters and spaces (e.g. previously processed lyrics)
+    if not (text.isascii() and text.islower() and text.replace(' ', '').isalpha()):
+        text = _NON_ALPHA_RE.sub('', text.lower())
     
-    # Tokenize
-    tokens = word_tokenize(text)
+    lemmatize, stop_words = _nlp()
     
-    # Apply preprocessing
-    processed_tokens = [lemmatizer.lemmatize(token) for token in tokens 
-                       if token not in stop_words and len(token) > 2]
+    # Tokenize (the text is already reduced to [a-z ], so a whitespace split is
+    # enough and also collapses repeated spaces) and filter in one pass; the
+    # length test is cheaper than the set lookup
+    processed_tokens = [lemmatize(token) for token in text.split()
+                       if len(token) > 2 and token not in stop_words]
     
     return ' '.join(processed_tokens)
 
@@ -71,36 +164,88 @@ def find_similar_songs_by_lyrics(lyrics_text, k=10):
     """
     if similarity_model is None:
         return []
-        
-    # Preprocess the input lyrics
-    processed_lyrics = preprocess_lyrics(lyrics_text)
     
+    processed_lyrics = preprocess_lyrics(lyrics_text)
     if not processed_lyrics:
         return []
     
-    # Vectorize the lyrics
-    lyrics_vector = vectorizer.transform([processed_lyrics])
+    return [dict(song) for song in _cached_search(processed_lyrics, k)]
+
+@lru_cache(maxsize=4096)
+def _cached_search(processed_lyrics, k):
+    """Search for one preprocessed query; results are frozen so cache hits can't be mutated"""
+    results = _search_processed([processed_lyrics], k)[0]
+    return tuple(tuple(song.items()) for song in results)
+
+def find_similar_songs_by_lyrics_batch(lyrics_texts, k=10):
+    """
+    Find similar songs for many lyrics queries at once
+    
+    All queries share one TF-IDF transform and one kneighbors call.
+    
+    Args:
+        lyrics_texts (list): Lyrics texts to find similar songs for
+        k (int): Number of similar songs to return per query
+    
+    Returns:
+        list: One list of similar songs per input text, in input order
+    """
+    if similarity_model is None:
+        return [[] for _ in lyrics_texts]
+        
+    # Preprocess the input lyrics
+    if len(lyrics_texts) >= PARALLEL_PREPROCESS_MIN:
+        with Pool(os.cpu_count()) as pool:
+            processed = pool.map(preprocess_lyrics, lyrics_texts, chunksize=PREPROCESS_CHUNKSIZE)
+    else:
+        processed = [preprocess_lyrics(text) for text in lyrics_texts]
     
-    # Apply SVD if needed
-    if model_type == "svd_knn" and svd_model is not None:
-        lyrics_vector = svd_model.transform(lyrics_vector)
+    return _search_processed(processed, k)
+
+def _search_processed(processed, k):
+    """Vectorize preprocessed queries and return one result list per query"""
+    batch_results = [[] for _ in processed]
+    positions = [i for i, text in enumerate(processed) if text]
+    
+    if not positions:
+        return batch_results
+    
+    # Vectorize the lyrics (and reduce them for SVD models); float32 halves the
+    # bytes moved by the search below (a no-op for models trained in float32)
+    lyrics_vectors = query_transform.transform([processed[i] for i in positions]).astype(np.float32, copy=False)
     
     # Find similar songs
-    distances, indices = similarity_model.kneighbors(lyrics_vector, n_neighbors=k)
+    if model_type == "svd_knn" and faiss_index is not None:
+        # Inner product of unit vectors is cosine similarity
+        lyrics_vectors = np.ascontiguousarray(lyrics_vectors)
+        faiss.normalize_L2(lyrics_vectors)
+        sims, indices = faiss_index.search(lyrics_vectors, k)
+        distances = 1 - sims
+    elif use_dot_product:
+        distances, indices = _cosine_kneighbors(lyrics_vectors, k)
+    else:
+        distances, indices = similarity_model.kneighbors(lyrics_vectors, n_neighbors=k)
     
     # Format results
-    results = []
-    for idx, distance in zip(indices[0], distances[0]):
-        if idx < len(training_metadata['training_songs']):
-            song_info = training_metadata['training_songs'][idx]
-            results.append({
-                'track_id': song_info['id'],
-                'name': song_info['name'],
-                'artist': song_info['artists_id'],
-                'similarity_score': float(1 - distance)  # Convert distance to similarity
-            })
-    
-    return results
+    for row, position in enumerate(positions):
+        # FAISS pads missing neighbours with -1
+        valid = (indices[row] >= 0) & (indices[row] < len(song_ids))
+        hit_indices = indices[row][valid]
+        similarities = 1 - distances[row][valid]  # Convert distance to similarity
+        batch_results[position] = [
+            {
+                'track_id': str(track_id),
+                'name': name,
+                'artist': artist,
+                'similarity_score': float(similarity)
+            }
+            for track_id, name, artist, similarity in zip(
+                song_ids[hit_indices], song_names[hit_indices], song_artists[hit_indices], similarities
+            )
+        ]
+    
+    return batch_results
 
 # Example usage:
 # recommendations = find_similar_songs_by_lyrics("your lyrics here", k=5)
+# batch_recommendations = find_similar_songs_by_lyrics_batch(["first lyrics", "second lyrics"], k=5)
@@ -4,7 +4,7 @@ Analyze and name clusters based on their musical characteristics
 """
 
 import os
-import pickle
+import joblib
 import asyncio
 import asyncpg
 import numpy as np
@@ -15,6 +15,11 @@ from collections import Counter
 import json
 
 
+def _encode_json(value):
+    """Compact JSON encoder for the asyncpg JSONB codec"""
+    return json.dumps(value, separators=(',', ':'))
+
+
 async def analyze_and_name_clusters():
     """Analyze cluster characteristics and assign meaningful names"""
     
@@ -24,14 +29,11 @@ async def analyze_and_name_clusters():
     logger.info("🧠 Loading trained models and data...")
     
     # Load cluster labels and embeddings
-    with open(os.path.join(models_dir, "cluster_labels.pkl"), 'rb') as f:
-        cluster_labels = pickle.load(f)
+    cluster_labels = joblib.load(os.path.join(models_dir, "cluster_labels.pkl"))
     
-    with open(os.path.join(models_dir, "audio_embeddings.pkl"), 'rb') as f:
-        audio_embeddings = pickle.load(f)
+    audio_embeddings = joblib.load(os.path.join(models_dir, "audio_embeddings.pkl"))
     
-    with open(os.path.join(models_dir, "song_indices.pkl"), 'rb') as f:
-        song_indices = pickle.load(f)
+    song_indices = joblib.load(os.path.join(models_dir, "song_indices.pkl"))
     
     track_ids = song_indices['track_ids']
     
@@ -45,6 +47,10 @@ async def analyze_and_name_clusters():
     
     logger.info("🔌 Connecting to database...")
     conn = await asyncpg.connect(database_url)
+    # Let asyncpg encode dicts straight into JSONB parameters
+    await conn.set_type_codec(
+        'jsonb', encoder=_encode_json, decoder=json.loads, schema='pg_catalog', format='text'
+    )
     
     try:
         # Get track data with audio features
@@ -114,14 +120,14 @@ async def analyze_and_name_clusters():
             audio_features = ['acousticness', 'danceability', 'energy', 'instrumentalness',
                             'liveness', 'loudness', 'speechiness', 'tempo', 'valence']
             
+            # Flat <feature>_<stat> keys, the same audio_stats shape that
+            # simple_cluster_analysis.py writes
             feature_stats = {}
             for feature in audio_features:
-                feature_stats[feature] = {
-                    'mean': float(cluster_df[feature].mean()),
-                    'std': float(cluster_df[feature].std()),
-                    'min': float(cluster_df[feature].min()),
-                    'max': float(cluster_df[feature].max())
-                }
+                feature_stats[f'{feature}_mean'] = float(cluster_df[feature].mean())
+                feature_stats[f'{feature}_std'] = float(cluster_df[feature].std())
+                feature_stats[f'{feature}_min'] = float(cluster_df[feature].min())
+                feature_stats[f'{feature}_max'] = float(cluster_df[feature].max())
             
             # Analyze musical characteristics
             avg_energy = cluster_df['energy'].mean()
@@ -320,7 +326,7 @@ async def analyze_and_name_clusters():
                 cluster['cohesion_score'],
                 cluster['dominant_features'],
                 cluster['era'],
-                json.dumps(cluster['audio_stats'])
+                cluster['audio_stats']
             )
         
         logger.success(f"✅ Successfully analyzed and named {len(cluster_analyses)} clusters!")
@@ -259,7 +259,7 @@ class Cluster(Base, TimestampMixin):
     separation_score = Column(Float)  # Separation from other clusters
     
     # Audio feature statistics (JSON for flexibility)
-    audio_stats = Column(JSON)  # Mean, std, min, max for each audio feature
+    audio_stats = Column(JSON)  # Flat <feature>_mean/_std/_min/_max keys per audio feature
     
     # Dominant characteristics
     dominant_genres = Column(ARRAY(String))
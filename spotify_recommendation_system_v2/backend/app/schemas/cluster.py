@@ -59,7 +59,7 @@ class ClusterResponse(BaseModel):
     era: Optional[str] = Field(None, description="Dominant time period")
     statistics: ClusterStats = Field(..., description="Cluster statistics")
     sample_tracks: List[ClusterTrack] = Field(default_factory=list, description="Sample tracks from cluster")
-    audio_stats: Optional[Dict[str, Any]] = Field(None, description="Detailed audio feature statistics")
+    audio_stats: Optional[Dict[str, Any]] = Field(None, description="Audio feature statistics as flat <feature>_mean/_std/_min/_max keys")
     
     class Config:
         from_attributes = True
@@ -4,7 +4,7 @@ Supports multiple feature extraction and dimensionality reduction methods
 """
 
 import os
-import pickle
+import joblib
 import json
 import pandas as pd
 import numpy as np
@@ -22,6 +22,12 @@ from app.database.models import Track, Artist, Album
 from app.config import settings
 from app.services.similarity_utils import similarity_calculator
 
+# Optional FAISS index for global neighbour queries
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
 
 class CompatibleHDBSCANModel:
     """Model loader that handles different HDBSCAN approach configurations"""
@@ -31,11 +37,13 @@ class CompatibleHDBSCANModel:
         self.model_name = model_name
         self.hdbscan_model = None
         self.knn_model = None
+        self.knn_index = None
         self.scaler = None
         self.pca_model = None
         self.audio_embeddings = None
         self.cluster_labels = None
         self.song_indices = None
+        self.cluster_members = {}
         self.config = None
         self.track_id_to_index = {}
         self.index_to_track_id = {}
@@ -53,7 +61,9 @@ class CompatibleHDBSCANModel:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        # Try to load model-specific files first, fallback to base files if needed
+        # Try to load model-specific files first, fallback to base files if needed.
+        # Artifacts are memory-mapped read-only (mmap_mode='r'), so variants that
+        # share the base files also share their pages
         model_prefix = f"{self.model_name}_"
         
         # Load HDBSCAN model
@@ -63,8 +73,7 @@ class CompatibleHDBSCANModel:
             hdbscan_path = os.path.join(self.models_dir, "hdbscan_model.pkl")
             logger.warning(f"Using base HDBSCAN model for {self.model_name}")
         
-        with open(hdbscan_path, 'rb') as f:
-            self.hdbscan_model = pickle.load(f)
+        self.hdbscan_model = joblib.load(hdbscan_path, mmap_mode='r')
             
         # Load KNN model
         knn_path = os.path.join(self.models_dir, f"{model_prefix}knn_model.pkl")
@@ -73,8 +82,16 @@ class CompatibleHDBSCANModel:
             knn_path = os.path.join(self.models_dir, "knn_model.pkl")
             logger.warning(f"Using base KNN model for {self.model_name}")
             
-        with open(knn_path, 'rb') as f:
-            self.knn_model = pickle.load(f)
+        self.knn_model = joblib.load(knn_path, mmap_mode='r')
+        
+        # Prefer the prebuilt FAISS index when one was written; it is memory-mapped
+        # like the other artifacts and also serves cluster queries via an ID selector
+        self.knn_index = None
+        knn_index_file = self.config.get('knn_index')
+        if knn_index_file and faiss is not None:
+            self.knn_index = faiss.read_index(
+                os.path.join(self.models_dir, knn_index_file), faiss.IO_FLAG_MMAP
+            )
             
         # Load audio embeddings
         embeddings_path = os.path.join(self.models_dir, f"{model_prefix}audio_embeddings.pkl")
@@ -83,8 +100,7 @@ class CompatibleHDBSCANModel:
             embeddings_path = os.path.join(self.models_dir, "audio_embeddings.pkl")
             logger.warning(f"Using base audio embeddings for {self.model_name}")
             
-        with open(embeddings_path, 'rb') as f:
-            self.audio_embeddings = pickle.load(f)
+        self.audio_embeddings = joblib.load(embeddings_path, mmap_mode='r')
             
         # Load cluster labels
         labels_path = os.path.join(self.models_dir, f"{model_prefix}cluster_labels.pkl")
@@ -93,8 +109,16 @@ class CompatibleHDBSCANModel:
             labels_path = os.path.join(self.models_dir, "cluster_labels.pkl")
             logger.warning(f"Using base cluster labels for {self.model_name}")
             
-        with open(labels_path, 'rb') as f:
-            self.cluster_labels = pickle.load(f)
+        self.cluster_labels = joblib.load(labels_path, mmap_mode='r')
+        
+        # Member indices per cluster, grouped once so cluster queries skip the
+        # full label scan; a stable sort keeps members in index order
+        labels = np.asarray(self.cluster_labels)
+        order = np.argsort(labels, kind='stable')
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        self.cluster_members = {
+            int(labels[members[0]]): members for members in np.split(order, boundaries) if len(members)
+        }
             
         # Load song indices
         indices_path = os.path.join(self.models_dir, f"{model_prefix}song_indices.pkl")
@@ -103,8 +127,7 @@ class CompatibleHDBSCANModel:
             indices_path = os.path.join(self.models_dir, "song_indices.pkl")
             logger.warning(f"Using base song indices for {self.model_name}")
             
-        with open(indices_path, 'rb') as f:
-            self.song_indices = pickle.load(f)
+        self.song_indices = joblib.load(indices_path, mmap_mode='r')
                 
         # Build index mappings
         if 'track_ids' in self.song_indices:
@@ -147,23 +170,43 @@ class CompatibleHDBSCANModel:
         # Find similar songs within the same cluster or globally based on config
         if self.config.get('cluster_based', True) and cluster_id != -1:
             # Cluster-based search
-            cluster_mask = self.cluster_labels == cluster_id
-            cluster_indices = np.where(cluster_mask)[0]
-            cluster_embeddings = self.audio_embeddings[cluster_mask]
-            
-            # Fit KNN on cluster
-            cluster_knn = NearestNeighbors(n_neighbors=min(k+1, len(cluster_embeddings)))
-            cluster_knn.fit(cluster_embeddings)
-            distances, local_indices = cluster_knn.kneighbors(song_embedding)
-            
-            # Convert to global indices
-            global_indices = cluster_indices[local_indices[0]]
-            distances = distances[0]
+            cluster_indices = self.cluster_members[int(cluster_id)]
+            n_neighbors = min(k+1, len(cluster_indices))
+            
+            if self.knn_index is not None:
+                # Restrict the global index to the cluster's members instead of
+                # keeping a second per-cluster copy of the embeddings; IndexFlatL2
+                # returns squared distances, sqrt matches sklearn's euclidean
+                params = faiss.SearchParameters(
+                    sel=faiss.IDSelectorArray(cluster_indices.astype(np.int64, copy=False))
+                )
+                sq_distances, indices = self.knn_index.search(
+                    np.ascontiguousarray(song_embedding, dtype=np.float32), n_neighbors, params=params
+                )
+                global_indices = indices[0]
+                distances = np.sqrt(sq_distances[0])
+            else:
+                # Fit KNN on cluster
+                cluster_knn = NearestNeighbors(n_neighbors=n_neighbors)
+                cluster_knn.fit(self.audio_embeddings[cluster_indices])
+                distances, local_indices = cluster_knn.kneighbors(song_embedding)
+                distances = distances[0]
+                
+                # Convert to global indices
+                global_indices = cluster_indices[local_indices[0]]
         else:
             # Global search
-            distances, indices = self.knn_model.kneighbors(song_embedding, n_neighbors=k+1)
-            global_indices = indices[0]
-            distances = distances[0]
+            if self.knn_index is not None:
+                # IndexFlatL2 returns squared distances; sqrt matches sklearn's euclidean
+                sq_distances, indices = self.knn_index.search(
+                    np.ascontiguousarray(song_embedding, dtype=np.float32), k+1
+                )
+                global_indices = indices[0]
+                distances = np.sqrt(sq_distances[0])
+            else:
+                distances, indices = self.knn_model.kneighbors(song_embedding, n_neighbors=k+1)
+                global_indices = indices[0]
+                distances = distances[0]
         
         # Filter out the source song and get track IDs
         similar_track_ids = []
@@ -14,7 +14,6 @@ import re
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy import select
@@ -23,6 +22,16 @@ from app.database.models import Track, Artist, Album
 from app.config import settings
 from app.services.similarity_utils import similarity_calculator
 
+# Optional FAISS index for the dense (SVD) lyrics models
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Lyrics cleaning patterns, compiled once at import
+_NON_ALPHA_RE = re.compile(r'[^a-z\s]')
+_MULTISPACE_RE = re.compile(r'\s+')
+
 
 class CompatibleLyricsSimilarityModel:
     """Model loader that handles individual model files for maximum compatibility"""
@@ -35,6 +44,7 @@ class CompatibleLyricsSimilarityModel:
         self.svd_model = None
         self.config = None
         self.metadata = None
+        self.ann_index = None
         
     def load_model(self, model_name: str = None):
         """Load a specific model by name"""
@@ -53,22 +63,41 @@ class CompatibleLyricsSimilarityModel:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
             
-        # Load the actual model(s)
+        # Load the actual model(s); memory-mapped so their fitted arrays are
+        # read from the page cache rather than copied into the process
         if self.config.get('has_svd', False):
             # Load SVD + KNN models separately
             svd_path = os.path.join(self.models_dir, f"lyrics_svd_model_{self.model_name}.pkl")
             knn_path = os.path.join(self.models_dir, f"lyrics_knn_model_{self.model_name}.pkl")
             
-            self.svd_model = joblib.load(svd_path)
-            self.model = joblib.load(knn_path)
+            self.svd_model = joblib.load(svd_path, mmap_mode='r')
+            self.model = joblib.load(knn_path, mmap_mode='r')
+            
+            # Prefer the prebuilt FAISS index when the pipeline produced one; it is
+            # the same index the generated production search module queries
+            self.ann_index = None
+            ann_filename = self.config.get('faiss_index')
+            if ann_filename and faiss is not None:
+                ann_index = faiss.read_index(os.path.join(self.models_dir, ann_filename))
+                if hasattr(ann_index, 'hnsw'):
+                    ann_index.hnsw.efSearch = 64
+                self.ann_index = ann_index
         else:
             # Load direct model
             model_path = os.path.join(self.models_dir, f"lyrics_similarity_model_{self.model_name}.pkl")
-            self.model = joblib.load(model_path)
+            self.model = joblib.load(model_path, mmap_mode='r')
+            self.svd_model = None
+            self.ann_index = None
             
         # Load metadata
         metadata_path = os.path.join(self.models_dir, "lyrics_training_metadata.pkl")
         self.metadata = joblib.load(metadata_path)
+        if 'ids' not in self.metadata:
+            # Older metadata stores one dict per song; convert to parallel arrays
+            songs = self.metadata.get('training_songs', [])
+            self.metadata['ids'] = np.array([song['id'] for song in songs], dtype=object)
+            self.metadata['names'] = np.array([song['name'] for song in songs], dtype=object)
+            self.metadata['artists'] = np.array([song['artists_id'] for song in songs], dtype=object)
         
         return self
         
@@ -76,8 +105,19 @@ class CompatibleLyricsSimilarityModel:
         """Find similar songs using the loaded model"""
         if self.config.get('has_svd', False):
             # Transform using SVD first
-            query_reduced = self.svd_model.transform(query_vector)
-            distances, indices = self.model.kneighbors(query_reduced, n_neighbors=k)
+            query_reduced = self.svd_model.transform(query_vector).astype(np.float32, copy=False)
+            if self.ann_index is not None:
+                # Inner product of unit vectors is cosine similarity; 1 - similarity
+                # matches sklearn's cosine distance
+                k = min(k, self.ann_index.ntotal)
+                if hasattr(self.ann_index, 'hnsw'):
+                    self.ann_index.hnsw.efSearch = max(64, k)  # search breadth must be >= k
+                query_reduced = np.ascontiguousarray(query_reduced)
+                faiss.normalize_L2(query_reduced)
+                sims, indices = self.ann_index.search(query_reduced, k)
+                distances = 1 - sims
+            else:
+                distances, indices = self.model.kneighbors(query_reduced, n_neighbors=k)
         else:
             distances, indices = self.model.kneighbors(query_vector, n_neighbors=k)
             
@@ -90,19 +130,17 @@ class CompatibleLyricsSimilarityModel:
             return ""
             
         # Basic cleaning
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
+        text = _NON_ALPHA_RE.sub('', text.lower())
+        text = _MULTISPACE_RE.sub(' ', text).strip()
         
         # Tokenize and process based on training method
         try:
-            tokens = word_tokenize(text)
             lemmatizer = WordNetLemmatizer()
-            stop_words = set(stopwords.words('english'))
+            stop_words = frozenset(stopwords.words('english'))
             
-            processed_tokens = [lemmatizer.lemmatize(token) for token in tokens 
-                              if token not in stop_words and len(token) > 2]
+            # Text is already reduced to [a-z ], so a split is enough
+            processed_tokens = [lemmatizer.lemmatize(token) for token in text.split()
+                              if len(token) > 2 and token not in stop_words]
             
             return ' '.join(processed_tokens)
         except:
@@ -128,9 +166,10 @@ class CompatibleLyricsSimilarityModel:
             'model_name': self.model_name,
             'model_type': self.config.get('model_type'),
             'has_svd': self.config.get('has_svd', False),
+            'ann_index': self.ann_index is not None,
             'sklearn_version': self.config.get('sklearn_version'),
             'parameters': self.config.get('model_params', {}),
-            'vocabulary_size': len(self.vectorizer.vocabulary_) if self.vectorizer else 0
+            'vocabulary_size': self.metadata.get('vocabulary_size', 0) if self.metadata else 0
         }
 
 
@@ -161,15 +200,19 @@ class LyricsSimilarityService:
         try:
             # Initialize NLTK components
             try:
-                nltk.download('punkt', quiet=True)
-                nltk.download('stopwords', quiet=True)
-                nltk.download('wordnet', quiet=True)
+                # The image ships these corpora under NLTK_DATA; only download
+                # when they are missing (e.g. running outside Docker)
+                for resource in ('stopwords', 'wordnet'):
+                    try:
+                        nltk.data.find(f'corpora/{resource}')
+                    except LookupError:
+                        nltk.download(resource, quiet=True)
                 self.lemmatizer = WordNetLemmatizer()
-                self.stop_words = set(stopwords.words('english'))
+                self.stop_words = frozenset(stopwords.words('english'))
             except Exception as e:
                 logger.warning(f"NLTK initialization warning: {e}")
                 self.lemmatizer = None
-                self.stop_words = set()
+                self.stop_words = frozenset()
             
             # Get available models
             available_models = self.model_loader.get_available_models()
@@ -254,23 +297,19 @@ class LyricsSimilarityService:
             return ""
         
         # Convert to lowercase and clean
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
+        text = _NON_ALPHA_RE.sub('', text.lower())
+        text = _MULTISPACE_RE.sub(' ', text).strip()
         
         if not self.lemmatizer or not self.stop_words:
             return text
         
         try:
-            # Tokenize
-            tokens = word_tokenize(text)
-            
-            # Apply lemmatization and remove stopwords
+            # Tokenize (the text is already reduced to [a-z ], so a split is
+            # enough), lemmatize and remove stopwords; length is checked first
             processed_tokens = [
                 self.lemmatizer.lemmatize(token) 
-                for token in tokens 
-                if token not in self.stop_words and len(token) > 2
+                for token in text.split() 
+                if len(token) > 2 and token not in self.stop_words
             ]
             
             return ' '.join(processed_tokens)
@@ -306,22 +345,24 @@ class LyricsSimilarityService:
         
         try:
             # Vectorize the lyrics
-            lyrics_vector = self.current_model.vectorizer.transform([processed_lyrics])
+            lyrics_vector = self.current_model.vectorizer.transform([processed_lyrics]).astype(np.float32, copy=False)
             
             # Find similar songs based on model type
             similar_indices, distances = self.current_model.find_similar(lyrics_vector, k=k)
             
             # Format results with distance
-            results = []
-            for idx, distance in zip(similar_indices, distances):
-                if idx < len(self.current_model.metadata['training_songs']):
-                    song_info = self.current_model.metadata['training_songs'][idx]
-                    results.append({
-                        'track_id': song_info['id'],
-                        'name': song_info['name'],
-                        'artist': song_info['artists_id'],
-                        'distance': float(distance)
-                    })
+            metadata = self.current_model.metadata
+            n_songs = len(metadata['ids'])
+            results = [
+                {
+                    'track_id': str(metadata['ids'][idx]),
+                    'name': metadata['names'][idx],
+                    'artist': metadata['artists'][idx],
+                    'distance': float(distance)
+                }
+                for idx, distance in zip(similar_indices, distances)
+                if idx < n_songs
+            ]
             
             # Calculate similarity scores using the utility
             model_info = self.current_model.get_model_info()
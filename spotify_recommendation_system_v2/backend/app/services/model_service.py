@@ -4,7 +4,7 @@ Uses actual trained HDBSCAN clustering + KNN models for music recommendations
 """
 
 import os
-import pickle
+import joblib
 import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any, Tuple
@@ -88,30 +88,29 @@ class ModelService:
                 if not os.path.exists(file_path):
                     raise FileNotFoundError(f"Model file not found: {file_path}")
             
+            # Artifacts are loaded with mmap_mode='r': their NumPy arrays become
+            # read-only views of the files, shared through the page cache
+            # instead of copied into every worker's heap
+            
             # Load HDBSCAN model
             logger.info("📊 Loading HDBSCAN clustering model...")
-            with open(self.hdbscan_path, 'rb') as f:
-                self.hdbscan_model = pickle.load(f)
+            self.hdbscan_model = joblib.load(self.hdbscan_path, mmap_mode='r')
             
             # Load KNN model
             logger.info("🔍 Loading KNN recommendation model...")
-            with open(self.knn_path, 'rb') as f:
-                self.knn_model = pickle.load(f)
+            self.knn_model = joblib.load(self.knn_path, mmap_mode='r')
             
             # Load audio embeddings
             logger.info("🎵 Loading audio feature embeddings...")
-            with open(self.embeddings_path, 'rb') as f:
-                self.audio_embeddings = pickle.load(f)
+            self.audio_embeddings = joblib.load(self.embeddings_path, mmap_mode='r')
             
             # Load cluster labels
             logger.info("🏷️ Loading cluster labels...")
-            with open(self.labels_path, 'rb') as f:
-                self.cluster_labels = pickle.load(f)
+            self.cluster_labels = joblib.load(self.labels_path, mmap_mode='r')
             
             # Load song indices
             logger.info("📑 Loading song index mappings...")
-            with open(self.indices_path, 'rb') as f:
-                self.song_indices = pickle.load(f)
+            self.song_indices = joblib.load(self.indices_path, mmap_mode='r')
             
             # Create bidirectional mapping between track IDs and indices
             self._create_index_mappings()
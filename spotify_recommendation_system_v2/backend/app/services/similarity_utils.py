@@ -5,6 +5,25 @@ Similarity Utilities - Helper functions for converting distances to similarity s
 import numpy as np
 from typing import List, Tuple, Optional
 import math
+import statistics
+
+
+# Distance -> similarity conversions, keyed by method name so callers pay a
+# single dict lookup instead of a chain of string comparisons per distance
+_METHODS = {
+    # Exponential decay: similarity = exp(-distance * scale_factor)
+    # Good for distance values in range [0, 2-3]
+    "exponential": lambda d, s: math.exp(-d * s),
+    # Inverse: similarity = 1 / (1 + distance * scale_factor)
+    # Good for any distance range, asymptotically approaches 0
+    "inverse": lambda d, s: 1.0 / (1.0 + d * s),
+    # Gaussian: similarity = exp(-(distance^2) / (2 * scale_factor^2))
+    # Good for distance values where you want sharp dropoff
+    "gaussian": lambda d, s: math.exp(-(d * d) / (2 * s * s)),
+    # Linear: similarity = max(0, 1 - distance / scale_factor)
+    # Good when you know the maximum expected distance
+    "linear": lambda d, s: max(0.0, 1.0 - d / s),
+}
 
 
 def distance_to_similarity(distance: float, method: str = "exponential", scale_factor: float = 1.0) -> float:
@@ -19,40 +38,71 @@ def distance_to_similarity(distance: float, method: str = "exponential", scale_f
     Returns:
         float: Similarity score between 0 and 1
     """
-    if distance < 0:
-        distance = 0
-    
-    if method == "exponential":
-        # Exponential decay: similarity = exp(-distance * scale_factor)
-        # Good for distance values in range [0, 2-3]
-        return math.exp(-distance * scale_factor)
+    try:
+        convert = _METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown similarity method: {method}") from None
     
-    elif method == "inverse":
-        # Inverse: similarity = 1 / (1 + distance * scale_factor)
-        # Good for any distance range, asymptotically approaches 0
-        return 1.0 / (1.0 + distance * scale_factor)
+    return convert(max(distance, 0.0), scale_factor)
+
+
+# Methods whose auto-scaled output can bunch up well inside [0, 1] and so
+# benefit from a final min-max stretch; the others already spread sensibly
+_RENORMALIZE_METHODS = frozenset({"gaussian"})
+
+# At or below this many distances, plain Python math beats NumPy's array
+# allocation and dispatch overhead (typical recommendation pages are 10-20 items)
+_SMALL_N = 32
+
+
+def _small_normalize(distances: List[float], method: str, renormalize: bool) -> List[float]:
+    """Pure-Python equivalent of normalize_distances_to_similarities for short inputs"""
+    distances = [float(d) for d in distances]
     
+    # Same auto-scaling rules as the NumPy path
+    if method == "linear":
+        scale_factor = max(distances)
+        scale_factor = scale_factor if scale_factor > 0 else 1.0
+    elif method in ("exponential", "inverse"):
+        median = statistics.median(distances)
+        scale_factor = 1.0 / median if median > 0 else 1.0
     elif method == "gaussian":
-        # Gaussian: similarity = exp(-(distance^2) / (2 * scale_factor^2))
-        # Good for distance values where you want sharp dropoff
-        return math.exp(-(distance ** 2) / (2 * (scale_factor ** 2)))
+        std = statistics.pstdev(distances)
+        scale_factor = std if std > 0 else 1.0
+    else:
+        scale_factor = 1.0
     
-    elif method == "linear":
-        # Linear: similarity = max(0, 1 - distance / scale_factor)
-        # Good when you know the maximum expected distance
-        return max(0.0, 1.0 - (distance / scale_factor))
+    similarities = [distance_to_similarity(d, method, scale_factor) for d in distances]
+    if not renormalize:
+        return similarities
     
-    else:
-        raise ValueError(f"Unknown similarity method: {method}")
+    # Track min/max in a single pass, then stretch to 0-1
+    sim_min = sim_max = similarities[0]
+    for sim in similarities:
+        if sim < sim_min:
+            sim_min = sim
+        elif sim > sim_max:
+            sim_max = sim
+    if sim_max > sim_min:
+        span = sim_max - sim_min
+        similarities = [(sim - sim_min) / span for sim in similarities]
+    
+    return similarities
 
 
-def normalize_distances_to_similarities(distances: List[float], method: str = "exponential") -> List[float]:
+def normalize_distances_to_similarities(
+    distances: List[float],
+    method: str = "exponential",
+    renormalize: Optional[bool] = None
+) -> List[float]:
     """
     Convert a list of distances to normalized similarity scores
     
     Args:
         distances (List[float]): List of distance values
         method (str): Conversion method
+        renormalize (bool, optional): Apply a final min-max pass to the scores.
+            Defaults to doing so only for methods in _RENORMALIZE_METHODS.
     
     Returns:
         List[float]: List of similarity scores between 0 and 1
@@ -60,6 +110,12 @@ def normalize_distances_to_similarities(distances: List[float], method: str = "e
     if not distances:
         return []
     
+    if renormalize is None:
+        renormalize = method in _RENORMALIZE_METHODS
+    
+    if len(distances) <= _SMALL_N:
+        return _small_normalize(distances, method, renormalize)
+    
     distances = np.array(distances)
     
     # Auto-determine scale factor based on distance distribution
@@ -78,13 +134,19 @@ def normalize_distances_to_similarities(distances: List[float], method: str = "e
     else:
         scale_factor = 1.0
     
-    similarities = [distance_to_similarity(d, method, scale_factor) for d in distances]
+    # Plain Python floats so the un-renormalized path returns JSON-friendly values
+    scale_factor = float(scale_factor)
+    similarities = [distance_to_similarity(d, method, scale_factor) for d in distances.tolist()]
+    
+    if not renormalize:
+        return similarities
     
     # Additional normalization to ensure good spread
     similarities = np.array(similarities)
-    if similarities.max() > similarities.min():
+    sim_min, sim_max = similarities.min(), similarities.max()
+    if sim_max > sim_min:
         # Normalize to 0-1 range while preserving relative ordering
-        similarities = (similarities - similarities.min()) / (similarities.max() - similarities.min())
+        similarities = (similarities - sim_min) / (sim_max - sim_min)
     
     return similarities.tolist()
 
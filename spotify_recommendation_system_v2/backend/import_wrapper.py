@@ -5,8 +5,10 @@ Provides better error handling and prevents infinite loops
 """
 
 import asyncio
+import fcntl
 import sys
 import os
+import random
 import signal
 import time
 from loguru import logger
@@ -23,53 +25,41 @@ class ImportWrapper:
     
     def __init__(self):
         self.max_retries = 3
-        self.retry_delay = 60  # seconds
+        self.max_retry_delay = 60  # seconds, cap for exponential backoff
         self.lock_file = Path("/tmp/spotify_import.lock")
         self.success_file = Path("/tmp/spotify_import_success.flag")
+        self._lock_fd = os.open(self.lock_file, os.O_CREAT | os.O_RDWR, 0o644)
         
-    def create_lock_file(self):
-        """Create a lock file to prevent concurrent imports"""
+    def acquire_lock(self):
+        """Take an exclusive, non-blocking flock so concurrent imports can't overlap.
+        
+        The kernel drops the lock when the descriptor closes or the process dies,
+        so there is no stale lock to detect or clean up.
+        """
         try:
-            self.lock_file.write_text(str(os.getpid()))
-            logger.info(f"Created lock file: {self.lock_file}")
-        except Exception as e:
-            logger.error(f"Could not create lock file: {e}")
-            
-    def remove_lock_file(self):
-        """Remove the lock file"""
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.warning(f"Import process already holds lock: {self.lock_file}")
+            return False
+        
+        # Record the owner for anyone inspecting the file; the lock itself is the flock
+        os.ftruncate(self._lock_fd, 0)
+        os.write(self._lock_fd, str(os.getpid()).encode())
+        logger.info(f"Acquired lock: {self.lock_file}")
+        return True
+        
+    def release_lock(self):
+        """Release the lock by closing its descriptor"""
+        if self._lock_fd is None:
+            return
         try:
-            if self.lock_file.exists():
-                self.lock_file.unlink()
-                logger.info(f"Removed lock file: {self.lock_file}")
-        except Exception as e:
-            logger.error(f"Could not remove lock file: {e}")
+            os.close(self._lock_fd)
+            logger.info(f"Released lock: {self.lock_file}")
+        except OSError as e:
+            logger.error(f"Could not release lock: {e}")
+        finally:
+            self._lock_fd = None
             
-    def check_if_already_running(self):
-        """Check if another import process is already running"""
-        if self.lock_file.exists():
-            try:
-                pid_str = self.lock_file.read_text().strip()
-                pid = int(pid_str)
-                
-                # Check if process is still running
-                try:
-                    os.kill(pid, 0)  # Signal 0 just checks if process exists
-                    logger.warning(f"Import process already running with PID {pid}")
-                    return True
-                except OSError:
-                    # Process doesn't exist, remove stale lock file
-                    logger.info("Removing stale lock file")
-                    self.lock_file.unlink()
-                    
-            except (ValueError, FileNotFoundError):
-                # Invalid lock file, remove it
-                try:
-                    self.lock_file.unlink()
-                except:
-                    pass
-                    
-        return False
-        
     def check_if_already_completed(self):
         """Check if import was already completed successfully"""
         if self.success_file.exists():
@@ -95,7 +85,7 @@ class ImportWrapper:
             
     def cleanup(self):
         """Cleanup on exit"""
-        self.remove_lock_file()
+        self.release_lock()
         
     def signal_handler(self, signum, frame):
         """Handle termination signals gracefully"""
@@ -125,8 +115,10 @@ class ImportWrapper:
                 logger.error(f"❌ Import attempt {attempt} failed: {e}")
                 
                 if attempt < self.max_retries:
-                    logger.info(f"⏳ Waiting {self.retry_delay} seconds before retry...")
-                    await asyncio.sleep(self.retry_delay)
+                    # Exponential backoff with jitter: fast retries for transient flakes
+                    delay = min(self.max_retry_delay, 2 ** attempt) + random.uniform(0, 1)
+                    logger.info(f"⏳ Waiting {delay:.1f} seconds before retry...")
+                    await asyncio.sleep(delay)
                 else:
                     logger.error(f"❌ All {self.max_retries} import attempts failed")
                     return False
@@ -147,13 +139,10 @@ class ImportWrapper:
             if self.check_if_already_completed():
                 return True
                 
-            # Check if already running
-            if self.check_if_already_running():
+            # Take the lock, or bail out if another import holds it
+            if not self.acquire_lock():
                 logger.error("❌ Import process already running, exiting")
                 return False
-                
-            # Create lock file
-            self.create_lock_file()
             
             # Run the import
             success = await self.run_import_with_retries()
@@ -4,11 +4,14 @@ Populate cluster_id values in the database from trained model cluster labels
 """
 
 import os
-import pickle
+import joblib
 import asyncio
 import asyncpg
 from loguru import logger
 
+# Upper bound on batch UPDATEs in flight (one pooled connection each)
+MAX_CONCURRENT_BATCHES = 8
+
 
 async def populate_cluster_ids():
     """Populate cluster_id values in the database from the trained model"""
@@ -19,12 +22,10 @@ async def populate_cluster_ids():
     indices_path = os.path.join(models_dir, "song_indices.pkl")
     
     logger.info("🏷️ Loading cluster labels from trained model...")
-    with open(labels_path, 'rb') as f:
-        cluster_labels = pickle.load(f)
+    cluster_labels = joblib.load(labels_path)
     
     logger.info("📑 Loading song indices from trained model...")
-    with open(indices_path, 'rb') as f:
-        song_indices = pickle.load(f)
+    song_indices = joblib.load(indices_path)
     
     track_ids = song_indices['track_ids']
     
@@ -37,34 +38,37 @@ async def populate_cluster_ids():
     )
     
     logger.info("🔌 Connecting to database...")
-    conn = await asyncpg.connect(database_url)
+    pool = await asyncpg.create_pool(database_url, min_size=4, max_size=MAX_CONCURRENT_BATCHES)
     
     try:
-        # Update cluster_id values in batches
+        # Update cluster_id values in batches, issued concurrently over the pool
         batch_size = 1000
         total_updated = 0
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
         
-        for i in range(0, len(track_ids), batch_size):
-            batch_track_ids = track_ids[i:i+batch_size]
-            batch_cluster_ids = cluster_labels[i:i+batch_size]
-            
-            # Prepare update data
-            update_data = [
-                (track_id, int(cluster_id)) 
-                for track_id, cluster_id in zip(batch_track_ids, batch_cluster_ids)
-            ]
-            
-            # Execute batch update
-            await conn.executemany(
-                "UPDATE tracks SET cluster_id = $2 WHERE id = $1",
-                update_data
-            )
+        async def update_batch(update_data):
+            nonlocal total_updated
+            async with semaphore:
+                async with pool.acquire() as batch_conn:
+                    await batch_conn.executemany(
+                        "UPDATE tracks SET cluster_id = $2 WHERE id = $1",
+                        update_data
+                    )
             
             total_updated += len(update_data)
             logger.info(f"📈 Updated {total_updated}/{len(track_ids)} tracks with cluster IDs")
         
+        batches = [
+            [
+                (track_id, int(cluster_id))
+                for track_id, cluster_id in zip(track_ids[i:i+batch_size], cluster_labels[i:i+batch_size])
+            ]
+            for i in range(0, len(track_ids), batch_size)
+        ]
+        await asyncio.gather(*(update_batch(update_data) for update_data in batches))
+        
         # Get cluster statistics
-        cluster_stats = await conn.fetch("""
+        cluster_stats = await pool.fetch("""
             SELECT cluster_id, COUNT(*) as size 
             FROM tracks 
             WHERE cluster_id IS NOT NULL AND cluster_id != -1
@@ -82,8 +86,8 @@ async def populate_cluster_ids():
             logger.info(f"   ... and {len(cluster_stats) - 10} more clusters")
     
     finally:
-        await conn.close()
-        logger.info("🔌 Database connection closed")
+        await pool.close()
+        logger.info("🔌 Database connection pool closed")
 
 
 if __name__ == "__main__":
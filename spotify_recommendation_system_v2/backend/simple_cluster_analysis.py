@@ -8,6 +8,11 @@ import asyncpg
 import json
 
 
+def _encode_json(value):
+    """Compact JSON encoder for the asyncpg JSONB codec"""
+    return json.dumps(value, separators=(',', ':'))
+
+
 async def analyze_clusters():
     """Analyze and name clusters based on audio features"""
     
@@ -16,6 +21,10 @@ async def analyze_clusters():
     
     print("🔌 Connecting to database...")
     conn = await asyncpg.connect(database_url)
+    # Let asyncpg encode dicts straight into JSONB parameters
+    await conn.set_type_codec(
+        'jsonb', encoder=_encode_json, decoder=json.loads, schema='pg_catalog', format='text'
+    )
     
     try:
         # Create clusters table
@@ -139,13 +148,14 @@ async def analyze_clusters():
             
             description = f"A cluster of {size} tracks with {cluster_name.lower()} characteristics"
             
-            audio_stats = {
-                'energy': {'mean': avg_energy},
-                'valence': {'mean': avg_valence},
-                'danceability': {'mean': avg_danceability},
-                'acousticness': {'mean': avg_acousticness},
-                'tempo': {'mean': avg_tempo}
-            }
+            # Flat <feature>_mean keys, queried as audio_stats->>'energy_mean'
+            audio_stats = dict(
+                energy_mean=avg_energy,
+                valence_mean=avg_valence,
+                danceability_mean=avg_danceability,
+                acousticness_mean=avg_acousticness,
+                tempo_mean=avg_tempo
+            )
             
             # Insert cluster
             insert_query = """
@@ -164,7 +174,7 @@ async def analyze_clusters():
                 cohesion_score,
                 dominant_features,
                 "Mixed Era",
-                json.dumps(audio_stats)
+                audio_stats
             )
             
             print(f"✅ {cluster_name}: {size} tracks (cohesion: {cohesion_score:.3f})")
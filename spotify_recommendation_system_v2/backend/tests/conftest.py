@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The services import each other as `app.*` (the backend runs from backend/),
+# so make the package importable for the tests too
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+from app.services import similarity_utils
+from app.services.similarity_utils import _small_normalize, normalize_distances_to_similarities
+
+# Median 1.5, population std sqrt(1.25) and max 3 drive the auto-scaling below
+DISTANCES = [0.0, 1.0, 2.0, 3.0]
+
+
+def _stretch(values):
+    low, high = min(values), max(values)
+    return [(v - low) / (high - low) for v in values]
+
+
+EXPONENTIAL = [math.exp(-d / 1.5) for d in DISTANCES]
+INVERSE = [1.0 / (1.0 + d / 1.5) for d in DISTANCES]
+GAUSSIAN = [math.exp(-(d * d) / 2.5) for d in DISTANCES]
+LINEAR = [1.0 - d / 3.0 for d in DISTANCES]
+
+EXPECTED = {
+    ("exponential", None): EXPONENTIAL,
+    ("exponential", True): _stretch(EXPONENTIAL),
+    ("exponential", False): EXPONENTIAL,
+    ("inverse", None): INVERSE,
+    ("inverse", True): _stretch(INVERSE),
+    ("inverse", False): INVERSE,
+    # Gaussian is the only method renormalized by default
+    ("gaussian", None): _stretch(GAUSSIAN),
+    ("gaussian", True): _stretch(GAUSSIAN),
+    ("gaussian", False): GAUSSIAN,
+    ("linear", None): LINEAR,
+    ("linear", True): LINEAR,
+    ("linear", False): LINEAR,
+}
+
+
+# Repeating the input keeps the median/std/max, so both the small-input path
+# (4 items) and the NumPy path (40 items) must give the same pinned values
+@pytest.mark.parametrize("repeat", [1, 10])
+@pytest.mark.parametrize("method,renormalize", list(EXPECTED))
+def test_normalize_distances_to_similarities_values(method, renormalize, repeat):
+    result = normalize_distances_to_similarities(DISTANCES * repeat, method, renormalize)
+    assert result == pytest.approx(EXPECTED[method, renormalize] * repeat)
+    assert all(type(value) is float for value in result)
+
+
+def test_normalize_distances_to_similarities_edge_cases():
+    assert normalize_distances_to_similarities([]) == []
+    # Zero median falls back to a scale factor of 1
+    assert normalize_distances_to_similarities([0.0, 0.0], "exponential") == [1.0, 1.0]
+    # Zero std falls back to a scale factor of 1, and the identical scores are
+    # left alone rather than divided by a zero span
+    assert normalize_distances_to_similarities([1.0, 1.0], "gaussian") == [math.exp(-0.5)] * 2
+    with pytest.raises(ValueError):
+        normalize_distances_to_similarities([1.0], "unknown")
+
+
+@pytest.mark.parametrize("n", [1, 2, 17, 32, 33, 100])
+@pytest.mark.parametrize("renormalize", [True, False])
+@pytest.mark.parametrize("method", ["exponential", "inverse", "gaussian", "linear"])
+def test_small_normalize_matches_numpy_path(monkeypatch, method, renormalize, n):
+    rng = random.Random(n)
+    distances = [rng.uniform(0.0, 3.0) for _ in range(n)]
+    expected = _small_normalize(distances, method, renormalize)
+    # Force every length through the NumPy path
+    monkeypatch.setattr(similarity_utils, "_SMALL_N", 0)
+    assert normalize_distances_to_similarities(distances, method, renormalize) == pytest.approx(expected)
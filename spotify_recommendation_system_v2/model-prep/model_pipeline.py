@@ -16,11 +16,17 @@ Based on:
 import os
 import sys
 import logging
-import pickle
+import functools
+from operator import itemgetter
+import math
+import multiprocessing
 import json
+import hashlib
 import joblib
+from joblib import Parallel, delayed
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
@@ -28,20 +34,42 @@ from typing import Dict, Any, List, Tuple, Optional
 # ML libraries for HDBSCAN models
 import hdbscan
 from sklearn.neighbors import NearestNeighbors
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.preprocessing import MinMaxScaler, StandardScaler, FunctionTransformer
 from sklearn.decomposition import PCA
 from sklearn.cluster import HDBSCAN
+from sklearn.metrics import silhouette_score
 
 # ML libraries for lyrics models
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+import scipy.sparse as sp
 from sklearn.model_selection import train_test_split
 from sklearn.decomposition import TruncatedSVD
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
 import re
 
+# Optional fast JSON encoder for configs and evaluation summaries
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional FAISS indexes: exact KNN for the HDBSCAN embeddings and cosine
+# search over the SVD lyrics embeddings
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Optional JIT for the derived-feature kernel
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -53,6 +81,169 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Lyrics preprocessing patterns, compiled once at import
+_CLEAN_RE = re.compile(r'[^a-z\s]')
+_TOKEN_RE = re.compile(r'[a-z]{3,}')
+
+# Bump whenever _preprocess_chunk, the patterns above, the stop words or the
+# lemmatizer change, so cached processed_lyrics_*.parquet files are rebuilt
+LYRICS_PREPROCESS_VERSION = 1
+
+# Rows per worker task when preprocessing lyrics in parallel
+LYRICS_CHUNK_SIZE = 5000
+
+# Worker processes per inner pool (HDBSCAN variants, lyrics chunks). The two
+# phases run side by side in generate_all_models, so each gets about half the cores
+PHASE_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+
+# Above this many songs the SVD lyrics FAISS index switches from exact to HNSW
+LYRICS_FAISS_HNSW_MIN = 100_000
+
+# Hashed lyrics feature space; unigram+bigram collisions stay rare while the
+# per-column document-frequency pass below stays small
+LYRICS_HASH_FEATURES = 2 ** 18
+
+# Document-frequency limits applied to the hashed columns before TF-IDF and SVD,
+# the same vocabulary limits the earlier TfidfVectorizer used
+LYRICS_MIN_DF = 2
+LYRICS_MAX_DF = 0.8
+LYRICS_MAX_FEATURES = 5000
+
+# Basic audio features (12 features), read as float32 straight from the CSV
+BASIC_AUDIO_FEATURES = ['danceability', 'energy', 'valence', 'acousticness', 'instrumentalness',
+                        'liveness', 'loudness', 'speechiness', 'tempo', 'key', 'mode', 'time_signature']
+
+# Silhouette is O(N^2); a fixed sample is enough to rank the HDBSCAN variants
+SILHOUETTE_SAMPLE_SIZE = 10000
+
+
+def atomic_write(path: Path, content: str):
+    """Write a small file via rename so pollers never see it half-written; skip unchanged content.
+    
+    Shared with scripts/startup.py for its success/failure markers.
+    """
+    if path.exists() and path.read_text() == content:
+        return
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
+def _clean_and_lemmatize(text: str, lemmatize, stop_words) -> str:
+    """Clean, tokenize, drop stop words and lemmatize one lyrics string"""
+    # Lowercase and drop non-letters, then take runs of 3+ letters as tokens;
+    # equivalent to whitespace tokenizing the cleaned text and keeping len > 2
+    text = _CLEAN_RE.sub('', text.lower())
+    tokens = _TOKEN_RE.findall(text)
+    
+    # Apply preprocessing (lemmatization + stop word removal)
+    processed_tokens = [lemmatize(token) for token in tokens if token not in stop_words]
+    
+    return ' '.join(processed_tokens)
+
+
+def _preprocess_chunk(texts: np.ndarray, lemmatizer: WordNetLemmatizer, stop_words: frozenset) -> List[str]:
+    """Preprocess a chunk of non-null lyrics; module-level so worker processes can unpickle it"""
+    lemmatize = functools.lru_cache(maxsize=200_000)(lemmatizer.lemmatize)
+    return [_clean_and_lemmatize(text, lemmatize, stop_words) if text else "" for text in texts]
+
+
+# Columns produced by _build_derived_features
+N_DERIVED_FEATURES = 10
+
+
+def _build_derived_features_numpy(basic_vals: np.ndarray, out: np.ndarray) -> None:
+    """Write the derived audio features into out (N x 10), column by column"""
+    # Feature interactions
+    np.multiply(basic_vals[:, 0], basic_vals[:, 1], out=out[:, 0])  # danceability * energy
+    np.multiply(basic_vals[:, 2], basic_vals[:, 3], out=out[:, 1])  # valence * acousticness
+    np.multiply(basic_vals[:, 4], basic_vals[:, 5], out=out[:, 2])  # instrumentalness * liveness
+    
+    # Polynomial features
+    np.square(basic_vals[:, 0], out=out[:, 3])  # danceability^2
+    np.square(basic_vals[:, 1], out=out[:, 4])  # energy^2
+    np.square(basic_vals[:, 2], out=out[:, 5])  # valence^2
+    
+    # Log transformations (add small constant to avoid log(0))
+    np.log(basic_vals[:, 5] + 0.001, out=out[:, 6])  # log(liveness)
+    np.log(basic_vals[:, 7] + 0.001, out=out[:, 7])  # log(speechiness)
+    
+    # Ratios
+    np.divide(basic_vals[:, 1], basic_vals[:, 3] + 0.001, out=out[:, 8])  # energy/acousticness
+    np.divide(basic_vals[:, 0], basic_vals[:, 4] + 0.001, out=out[:, 9])  # danceability/instrumentalness
+
+
+def _build_derived_features_rows(basic_vals, out):
+    """Row-wise kernel equivalent to _build_derived_features_numpy, for Numba"""
+    for i in prange(basic_vals.shape[0]):
+        danceability = basic_vals[i, 0]
+        energy = basic_vals[i, 1]
+        valence = basic_vals[i, 2]
+        acousticness = basic_vals[i, 3]
+        instrumentalness = basic_vals[i, 4]
+        liveness = basic_vals[i, 5]
+        speechiness = basic_vals[i, 7]
+        
+        out[i, 0] = danceability * energy
+        out[i, 1] = valence * acousticness
+        out[i, 2] = instrumentalness * liveness
+        out[i, 3] = danceability * danceability
+        out[i, 4] = energy * energy
+        out[i, 5] = valence * valence
+        out[i, 6] = math.log(liveness + 0.001)
+        out[i, 7] = math.log(speechiness + 0.001)
+        out[i, 8] = energy / (acousticness + 0.001)
+        out[i, 9] = danceability / (instrumentalness + 0.001)
+
+
+# With Numba the ten derivations fuse into a single parallel pass with no
+# temporaries; otherwise fall back to NumPy ufuncs writing into the buffer
+if njit is not None:
+    _build_derived_features = njit(parallel=True, fastmath=True)(_build_derived_features_rows)
+else:
+    _build_derived_features = _build_derived_features_numpy
+
+
+def _train_hdbscan_variant(features: np.ndarray, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Fit HDBSCAN, score it and fit the KNN model for one feature variant.
+    
+    Module-level so it can run in a worker process.
+    """
+    # Train HDBSCAN
+    clusterer = hdbscan.HDBSCAN(
+        min_cluster_size=config['min_cluster_size'],
+        min_samples=config['min_samples'], 
+        metric=config['metric'],
+        cluster_selection_epsilon=0.1
+    )
+    
+    cluster_labels = clusterer.fit_predict(features)
+    n_clusters = len(set(cluster_labels)) - (1 if -1 in cluster_labels else 0)
+    n_noise = int(np.count_nonzero(cluster_labels == -1))
+    
+    # Calculate silhouette score for model comparison
+    if n_clusters > 1:
+        silhouette_avg = silhouette_score(
+            features.astype(np.float32, copy=False), cluster_labels,
+            sample_size=SILHOUETTE_SAMPLE_SIZE, random_state=42, metric='euclidean'
+        )
+    else:
+        silhouette_avg = -1
+    
+    # Train KNN model for recommendations within clusters
+    knn_model = NearestNeighbors(n_neighbors=6, algorithm='auto', metric='euclidean')
+    knn_model.fit(features)
+    
+    return {
+        'clusterer': clusterer,
+        'knn_model': knn_model,
+        'labels': cluster_labels,
+        'n_clusters': n_clusters,
+        'n_noise': n_noise,
+        'silhouette_score': silhouette_avg
+    }
+
+
 class ModelPipeline:
     def __init__(self, data_dir: str = "/app/data", models_dir: str = "/app/data/models"):
         self.data_dir = Path(data_dir)
@@ -72,54 +263,102 @@ class ModelPipeline:
         logger.info(f"Initialized ModelPipeline with data_dir={data_dir}, models_dir={models_dir}")
 
     def _setup_nltk(self):
-        """Download required NLTK data for lyrics processing"""
+        """Load NLTK data for lyrics processing, downloading only what is missing"""
         try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
+            # The image ships these corpora (see Dockerfile); only fall back to
+            # a network download when running outside of it
+            for resource in ('stopwords', 'wordnet'):
+                try:
+                    nltk.data.find(f'corpora/{resource}')
+                except LookupError:
+                    nltk.download(resource, quiet=True)
             
             self.lemmatizer = WordNetLemmatizer()
-            self.stop_words = set(stopwords.words('english'))
+            self.stop_words = frozenset(stopwords.words('english'))
+            
+            # Memoized lemmatizer for preprocess_lyrics; lyrics vocabularies
+            # repeat heavily, so most lemmatize calls are cache hits
+            self._lemmatize = functools.lru_cache(maxsize=200_000)(self.lemmatizer.lemmatize)
             logger.info("✅ NLTK setup completed")
         except Exception as e:
             logger.error(f"❌ NLTK setup failed: {e}")
             raise
 
+    def __getstate__(self):
+        # The memoized lemmatizer can't be pickled; rebuild it on the other side
+        state = self.__dict__.copy()
+        state.pop('_lemmatize', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lemmatize = functools.lru_cache(maxsize=200_000)(self.lemmatizer.lemmatize)
+
     def _create_status_markers(self, model_type: str, success: bool = True):
         """Create success/failure marker files"""
         if success:
             marker_file = self.models_dir / f".{model_type}_success"
             self.success_markers[model_type] = marker_file
-            marker_file.touch()
+            atomic_write(marker_file, "")
             if model_type in self.failure_markers:
                 self.failure_markers[model_type].unlink(missing_ok=True)
         else:
             marker_file = self.models_dir / f".{model_type}_failed"
             self.failure_markers[model_type] = marker_file
-            marker_file.touch()
+            atomic_write(marker_file, "")
 
     def _check_existing_models(self, model_type: str, required_files: List[str]) -> bool:
         """Check if model already exists and is complete"""
-        success_marker = self.models_dir / f".{model_type}_success"
-        if not success_marker.exists():
+        existing = set(os.listdir(self.models_dir)) if self.models_dir.exists() else set()
+        if f".{model_type}_success" not in existing:
             return False
             
         # Check if all required files exist
         for file_name in required_files:
-            if not (self.models_dir / file_name).exists():
+            if file_name not in existing:
                 logger.info(f"Missing file for {model_type}: {file_name}")
                 return False
                 
         return True
 
+    def _dump(self, filename: str, obj: Any):
+        """Write a model artifact with joblib so readers can memory-map its arrays"""
+        # Left uncompressed on purpose: joblib can only mmap raw array data, and
+        # the services load these with mmap_mode='r'
+        joblib.dump(obj, self.models_dir / filename)
+
+    def _write_json(self, filename: str, data: Any):
+        """Write a pretty-printed JSON artifact, via orjson when it is installed"""
+        path = self.models_dir / filename
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2)
+
+    def _link_artifact(self, link_name: str, target_name: str):
+        """Expose an existing model file under another name without rewriting it"""
+        link_path = self.models_dir / link_name
+        link_path.unlink(missing_ok=True)
+        try:
+            link_path.symlink_to(target_name)
+        except OSError:
+            # Filesystems without symlink support (e.g. some Windows mounts)
+            os.link(self.models_dir / target_name, link_path)
+
     def load_spotify_data(self) -> pd.DataFrame:
         """Load and validate Spotify tracks data"""
         if not self.spotify_tracks_path.exists():
             raise FileNotFoundError(f"Spotify tracks data not found at {self.spotify_tracks_path}")
         
         logger.info("📊 Loading Spotify tracks data...")
-        df = pd.read_csv(self.spotify_tracks_path)
+        # PyArrow parses multi-threaded; explicit float32 skips dtype inference
+        # on the feature columns and halves their footprint
+        df = pd.read_csv(
+            self.spotify_tracks_path,
+            engine='pyarrow',
+            dtype={col: 'float32' for col in BASIC_AUDIO_FEATURES}
+        )
         logger.info(f"Loaded {len(df)} tracks with {len(df.columns)} columns")
         
         # Validate required columns
@@ -137,16 +376,16 @@ class ModelPipeline:
         """Prepare different feature sets for HDBSCAN variants"""
         logger.info("🔧 Preparing HDBSCAN feature sets...")
         
-        # Basic audio features (12 features)
-        basic_features = ['danceability', 'energy', 'valence', 'acousticness', 'instrumentalness', 
-                         'liveness', 'loudness', 'speechiness', 'tempo', 'key', 'mode', 'time_signature']
+        # Extract the basic feature block once; every variant below builds on it
+        basic_vals = df[BASIC_AUDIO_FEATURES].to_numpy(dtype=np.float32, copy=True)
+        np.nan_to_num(basic_vals, copy=False)
         
         # Load low-level audio features if available
         low_level_features_path = self.data_dir / "raw" / "low_level_audio_features.csv"
         
         if low_level_features_path.exists():
             logger.info("📊 Loading low-level audio features...")
-            df_llav = pd.read_csv(low_level_features_path)
+            df_llav = pd.read_csv(low_level_features_path, engine='pyarrow')
             
             # Merge with main dataset
             df_merged = pd.merge(df, df_llav, left_on='id', right_on='track_id', how='left')
@@ -160,56 +399,41 @@ class ModelPipeline:
             logger.warning("⚠️ Low-level audio features not found, using derived features")
             # Create derived features from basic audio features
             n_tracks = len(df)
-            basic_vals = df[basic_features].fillna(0).values
-            
-            # Create additional derived features
-            derived_features = []
-            
-            # Feature interactions
-            derived_features.append((basic_vals[:, 0] * basic_vals[:, 1]).reshape(-1, 1))  # danceability * energy
-            derived_features.append((basic_vals[:, 2] * basic_vals[:, 3]).reshape(-1, 1))  # valence * acousticness
-            derived_features.append((basic_vals[:, 4] * basic_vals[:, 5]).reshape(-1, 1))  # instrumentalness * liveness
-            
-            # Polynomial features
-            derived_features.append(np.power(basic_vals[:, 0], 2).reshape(-1, 1))  # danceability^2
-            derived_features.append(np.power(basic_vals[:, 1], 2).reshape(-1, 1))  # energy^2
-            derived_features.append(np.power(basic_vals[:, 2], 2).reshape(-1, 1))  # valence^2
-            
-            # Log transformations (add small constant to avoid log(0))
-            derived_features.append(np.log(basic_vals[:, 5] + 0.001).reshape(-1, 1))  # log(liveness)
-            derived_features.append(np.log(basic_vals[:, 7] + 0.001).reshape(-1, 1))  # log(speechiness)
             
-            # Ratios
-            derived_features.append((basic_vals[:, 1] / (basic_vals[:, 3] + 0.001)).reshape(-1, 1))  # energy/acousticness
-            derived_features.append((basic_vals[:, 0] / (basic_vals[:, 4] + 0.001)).reshape(-1, 1))  # danceability/instrumentalness
-            
-            # Combine all derived features
-            low_level_features = np.hstack(derived_features)
+            # Create additional derived features in one fused pass over the rows
+            low_level_features = np.empty((n_tracks, N_DERIVED_FEATURES), dtype=np.float32)
+            _build_derived_features(basic_vals, low_level_features)
             logger.info(f"✅ Created {low_level_features.shape[1]} derived audio features")
         
         # Prepare feature sets
         feature_sets = {}
         
         # 1. Naive features (basic 12 features)
-        naive_features = df[basic_features].fillna(0).values
-        scaler_naive = MinMaxScaler()
-        feature_sets['naive_features'] = scaler_naive.fit_transform(naive_features)
+        # Scaled in place; the derived features above were already computed from it
+        scaler_naive = MinMaxScaler(copy=False)
+        feature_sets['naive_features'] = scaler_naive.fit_transform(basic_vals)
         
         # 2. PCA features (reduced basic features)
-        pca_basic = PCA(n_components=6, random_state=42)
+        pca_basic = PCA(n_components=6, svd_solver='randomized', random_state=42)
         feature_sets['pca_features'] = pca_basic.fit_transform(feature_sets['naive_features'])
         
-        # 3. Combined features (basic + low-level)
-        combined_raw = np.hstack([naive_features, low_level_features])
-        scaler_combined = StandardScaler()
-        feature_sets['combined_features'] = scaler_combined.fit_transform(combined_raw)
+        # Standardize the low-level block once; it feeds both variants 3 and 4
+        scaler_llav = StandardScaler(copy=False)
+        llav_standardized = scaler_llav.fit_transform(low_level_features)
+        
+        # 3. Combined features (basic + low-level); standardization is per column,
+        # so stacking separately standardized blocks matches scaling the hstack.
+        # Standardizing is invariant to the per-column affine min-max step, so
+        # the min-max scaled block gives the same result as the raw one
+        basic_standardized = StandardScaler().fit_transform(feature_sets['naive_features'])
+        feature_sets['combined_features'] = np.hstack([basic_standardized, llav_standardized])
         
         # 4. Low-level audio features only
-        scaler_llav = StandardScaler()  
-        feature_sets['llav_features'] = scaler_llav.fit_transform(low_level_features)
+        feature_sets['llav_features'] = llav_standardized
         
-        # 5. Low-level PCA features (60 components)
-        pca_llav = PCA(n_components=60, random_state=42)
+        # 5. Low-level PCA features (60 components); randomized SVD is O(N·D·k)
+        # rather than a full decomposition of the low-level matrix
+        pca_llav = PCA(n_components=60, svd_solver='randomized', random_state=42)
         feature_sets['llav_pca'] = pca_llav.fit_transform(feature_sets['llav_features'])
         
         logger.info(f"✅ Prepared {len(feature_sets)} feature sets")
@@ -260,33 +484,52 @@ class ModelPipeline:
                 'llav_pca': {'min_cluster_size': 20, 'min_samples': 6, 'metric': 'euclidean'}
             }
             
+            # Song indices are identical for every variant: write them once and
+            # point the per-variant file names at that copy
+            # Track IDs are fixed-width (22-char base62), so a numpy unicode array
+            # is stored as one contiguous (mappable) buffer instead of N Python str objects
+            track_ids = np.asarray(df['id'].values, dtype=str)
+            song_indices = {
+                'track_ids': track_ids,
+                'track_names': df['name'].values,
+                'track_artists': df['artists_id'].values,
+                'track_uris': df['uri'].values if 'uri' in df.columns else track_ids
+            }
+            self._dump("song_indices.pkl", song_indices)
+            
             best_model_info = None
             best_score = -1
+            trained_knn_models = {}
+            all_configs = {}
             
-            # Generate each variant
+            # Train the variants in parallel; each fits on an independent feature
+            # matrix, so only the results come back for the serial writes below
+            with ProcessPoolExecutor(
+                max_workers=min(len(feature_sets), PHASE_WORKERS),
+                mp_context=multiprocessing.get_context('forkserver')
+            ) as executor:
+                futures = {
+                    variant_name: executor.submit(_train_hdbscan_variant, features, hdbscan_configs[variant_name])
+                    for variant_name, features in feature_sets.items()
+                }
+                logger.info(f"🤖 Training {len(futures)} HDBSCAN variants in parallel...")
+                variant_results = {variant_name: future.result() for variant_name, future in futures.items()}
+            
+            # Save each variant
             for variant_name, features in feature_sets.items():
-                logger.info(f"🤖 Training {variant_name} HDBSCAN model...")
-                
                 config = hdbscan_configs[variant_name]
+                result = variant_results[variant_name]
+                clusterer = result['clusterer']
+                knn_model = result['knn_model']
+                cluster_labels = result['labels']
+                n_clusters = result['n_clusters']
+                n_noise = result['n_noise']
+                silhouette_avg = result['silhouette_score']
+                trained_knn_models[variant_name] = knn_model
                 
-                # Train HDBSCAN
-                clusterer = hdbscan.HDBSCAN(
-                    min_cluster_size=config['min_cluster_size'],
-                    min_samples=config['min_samples'], 
-                    metric=config['metric'],
-                    cluster_selection_epsilon=0.1
-                )
-                
-                cluster_labels = clusterer.fit_predict(features)
-                n_clusters = len(set(cluster_labels)) - (1 if -1 in cluster_labels else 0)
-                n_noise = list(cluster_labels).count(-1)
+                logger.info(f"🤖 {variant_name}: Clusters: {n_clusters}, Noise points: {n_noise}")
                 
-                logger.info(f"  - Clusters: {n_clusters}, Noise points: {n_noise}")
-                
-                # Calculate silhouette score for model comparison
                 if n_clusters > 1:
-                    from sklearn.metrics import silhouette_score
-                    silhouette_avg = silhouette_score(features, cluster_labels)
                     logger.info(f"  - Silhouette score: {silhouette_avg:.4f}")
                     
                     if silhouette_avg > best_score:
@@ -297,33 +540,27 @@ class ModelPipeline:
                             'features': features,
                             'labels': cluster_labels
                         }
-                else:
-                    silhouette_avg = -1
-                
-                # Train KNN model for recommendations within clusters
-                knn_model = NearestNeighbors(n_neighbors=6, algorithm='auto', metric='euclidean')
-                knn_model.fit(features)
-                
-                # Create song indices mapping
-                song_indices = {
-                    'track_ids': df['id'].values,
-                    'track_names': df['name'].values,
-                    'track_artists': df['artists_id'].values,
-                    'track_uris': df['uri'].values if 'uri' in df.columns else df['id'].values
-                }
                 
                 # Save variant-specific models
                 variant_files = {
                     f"{variant_name}_hdbscan_model.pkl": clusterer,
                     f"{variant_name}_knn_model.pkl": knn_model,
                     f"{variant_name}_audio_embeddings.pkl": features,
-                    f"{variant_name}_cluster_labels.pkl": cluster_labels,
-                    f"{variant_name}_song_indices.pkl": song_indices
+                    f"{variant_name}_cluster_labels.pkl": cluster_labels
                 }
                 
                 for filename, obj in variant_files.items():
-                    with open(self.models_dir / filename, 'wb') as f:
-                        pickle.dump(obj, f)
+                    self._dump(filename, obj)
+                self._link_artifact(f"{variant_name}_song_indices.pkl", "song_indices.pkl")
+                
+                # Exact L2 index over the same embeddings; FAISS answers global
+                # neighbour queries with SIMD GEMM instead of sklearn's brute path
+                knn_index_file = None
+                if faiss is not None:
+                    knn_index = faiss.IndexFlatL2(features.shape[1])
+                    knn_index.add(np.ascontiguousarray(features, dtype=np.float32))
+                    knn_index_file = f"{variant_name}_knn_index.faiss"
+                    faiss.write_index(knn_index, str(self.models_dir / knn_index_file))
                 
                 # Save configuration
                 config_data = {
@@ -333,43 +570,33 @@ class ModelPipeline:
                     'n_clusters': int(n_clusters),
                     'n_noise_points': int(n_noise),
                     'silhouette_score': float(silhouette_avg),
+                    'knn_index': knn_index_file,
                     'created_at': datetime.now().isoformat()
                 }
                 
-                config_path = self.models_dir / f"hdbscan_config_{variant_name}.json"
-                with open(config_path, 'w') as f:
-                    json.dump(config_data, f, indent=2)
+                # Per-variant file stays for the backend loader; the combined
+                # file below carries every variant in a single write
+                self._write_json(f"hdbscan_config_{variant_name}.json", config_data)
+                all_configs[variant_name] = config_data
                 
                 logger.info(f"✅ {variant_name} HDBSCAN model saved")
             
+            self._write_json("hdbscan_configs.json", all_configs)
+            
             # Save base models (best performing variant for backward compatibility)
             if best_model_info:
                 logger.info(f"🏆 Best model: {best_model_info['variant']} (score: {best_score:.4f})")
                 
                 base_files_map = {
                     "hdbscan_model.pkl": best_model_info['clusterer'],
-                    "knn_model.pkl": None,  # Will be created below
+                    # Same features and params as the variant's KNN, so reuse the fit
+                    "knn_model.pkl": trained_knn_models[best_model_info['variant']],
                     "audio_embeddings.pkl": best_model_info['features'],
-                    "cluster_labels.pkl": best_model_info['labels'],
-                    "song_indices.pkl": None  # Will be created below
-                }
-                
-                # Create base KNN and song indices
-                base_knn = NearestNeighbors(n_neighbors=6, algorithm='auto', metric='euclidean')
-                base_knn.fit(best_model_info['features'])
-                base_files_map["knn_model.pkl"] = base_knn
-                
-                base_song_indices = {
-                    'track_ids': df['id'].values,
-                    'track_names': df['name'].values,
-                    'track_artists': df['artists_id'].values,
-                    'track_uris': df['uri'].values if 'uri' in df.columns else df['id'].values
+                    "cluster_labels.pkl": best_model_info['labels']
                 }
-                base_files_map["song_indices.pkl"] = base_song_indices
                 
                 for filename, obj in base_files_map.items():
-                    with open(self.models_dir / filename, 'wb') as f:
-                        pickle.dump(obj, f)
+                    self._dump(filename, obj)
                 
                 logger.info("✅ Base models saved for backward compatibility")
             
@@ -387,20 +614,7 @@ class ModelPipeline:
         if pd.isna(text) or not text:
             return ""
         
-        # Convert to lowercase and clean
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        # Tokenize
-        tokens = word_tokenize(text)
-        
-        # Apply preprocessing (lemmatization + stop word removal)
-        processed_tokens = [self.lemmatizer.lemmatize(token) for token in tokens 
-                           if token not in self.stop_words and len(token) > 2]
-        
-        return ' '.join(processed_tokens)
+        return _clean_and_lemmatize(text, self._lemmatize, self.stop_words)
 
     def generate_lyrics_models(self, df: pd.DataFrame, force_regenerate: bool = False) -> bool:
         """Generate lyrics similarity models"""
@@ -443,9 +657,31 @@ class ModelPipeline:
                 
             logger.info(f"📝 Processing {len(lyrics_df)} songs with lyrics")
             
-            # Preprocess lyrics
-            logger.info("🔧 Preprocessing lyrics...")
-            lyrics_df['processed_lyrics'] = lyrics_df['lyrics'].apply(self.preprocess_lyrics)
+            # Preprocessed lyrics are cached by the preprocessing version and a hash
+            # of the raw column, so reruns over the same data skip preprocessing
+            lyrics_hash = hashlib.blake2b(digest_size=8)
+            lyrics_hash.update(f"v{LYRICS_PREPROCESS_VERSION}".encode())
+            lyrics_hash.update(pd.util.hash_pandas_object(lyrics_df['lyrics']).values.tobytes())
+            lyrics_key = lyrics_hash.hexdigest()
+            cache_path = self.models_dir / f"processed_lyrics_{lyrics_key}.parquet"
+            
+            if cache_path.exists():
+                logger.info(f"📦 Using cached preprocessed lyrics: {cache_path.name}")
+                lyrics_df['processed_lyrics'] = pd.read_parquet(cache_path)['processed_lyrics'].values
+            else:
+                # Preprocess lyrics across all cores; rows are already non-null
+                logger.info("🔧 Preprocessing lyrics...")
+                lyrics_values = lyrics_df['lyrics'].values
+                n_chunks = max(1, min(PHASE_WORKERS, -(-len(lyrics_values) // LYRICS_CHUNK_SIZE)))
+                chunk_results = Parallel(n_jobs=PHASE_WORKERS, backend='loky')(
+                    delayed(_preprocess_chunk)(chunk, self.lemmatizer, self.stop_words)
+                    for chunk in np.array_split(lyrics_values, n_chunks)
+                )
+                lyrics_df['processed_lyrics'] = np.concatenate(chunk_results)
+                # Only the current cache is ever read again; drop older ones
+                for stale_path in self.models_dir.glob("processed_lyrics_*.parquet"):
+                    stale_path.unlink()
+                lyrics_df[['id', 'processed_lyrics']].to_parquet(cache_path, index=False)
             
             # Remove songs with empty processed lyrics
             lyrics_df = lyrics_df[lyrics_df['processed_lyrics'].str.len() > 0]
@@ -455,22 +691,58 @@ class ModelPipeline:
                 logger.warning("⚠️ Too few songs with valid lyrics, skipping lyrics models")
                 return True
             
-            # Split data
-            train_df, val_df = train_test_split(lyrics_df, test_size=0.2, random_state=42)
-            logger.info(f"📊 Train: {len(train_df)}, Validation: {len(val_df)}")
-            
-            # Create TF-IDF vectorizer
+            # Create TF-IDF vectorizer. Hashing needs no shared vocabulary, so the
+            # term counts are built chunk-parallel and stacked; only the idf fit
+            # runs on the whole matrix
             logger.info("🔧 Creating TF-IDF vectorizer...")
-            vectorizer = TfidfVectorizer(
-                max_features=5000,
-                min_df=2,
-                max_df=0.8,
+            hashing_vectorizer = HashingVectorizer(
+                n_features=LYRICS_HASH_FEATURES,
+                alternate_sign=False,
+                norm=None,
                 ngram_range=(1, 2),
-                stop_words='english'
+                stop_words='english',
+                dtype=np.float32
             )
+            processed_values = lyrics_df['processed_lyrics'].values
+            n_chunks = max(1, min(PHASE_WORKERS, -(-len(processed_values) // LYRICS_CHUNK_SIZE)))
+            X_counts = sp.vstack(Parallel(n_jobs=PHASE_WORKERS, backend='loky')(
+                delayed(hashing_vectorizer.transform)(chunk)
+                for chunk in np.array_split(processed_values, n_chunks)
+            ), format='csr')
             
-            X_train_tfidf = vectorizer.fit_transform(train_df['processed_lyrics'])
-            X_val_tfidf = vectorizer.transform(val_df['processed_lyrics'])
+            # Keep only the columns min_df/max_df/max_features would have kept as
+            # vocabulary, so SVD and KNN see at most LYRICS_MAX_FEATURES columns
+            # rather than the whole hash space
+            doc_freq = X_counts.getnnz(axis=0)
+            eligible = np.flatnonzero(
+                (doc_freq >= LYRICS_MIN_DF) & (doc_freq <= LYRICS_MAX_DF * X_counts.shape[0])
+            )
+            if len(eligible) > LYRICS_MAX_FEATURES:
+                # Most frequent terms across the corpus, as max_features picks them
+                term_freq = np.asarray(X_counts[:, eligible].sum(axis=0)).ravel()
+                eligible = eligible[np.argsort(-term_freq, kind='stable')[:LYRICS_MAX_FEATURES]]
+            kept_columns = np.sort(eligible)
+            X_counts = X_counts[:, kept_columns]
+            column_filter = FunctionTransformer(itemgetter((slice(None), kept_columns)), accept_sparse=True)
+            
+            tfidf_transformer = TfidfTransformer(sublinear_tf=True)
+            vectorizer = Pipeline([
+                ('hv', hashing_vectorizer), ('df_filter', column_filter), ('tfidf', tfidf_transformer)
+            ])
+            
+            # Fit once on the whole corpus and split the matrix rows, so the
+            # validation set needs no second tokenize/transform pass. float32 end
+            # to end halves the bytes moved through SVD and cosine KNN
+            X_all_tfidf = tfidf_transformer.fit_transform(X_counts).astype(np.float32, copy=False)
+            vocabulary_size = len(kept_columns)
+            
+            # Split data
+            train_idx, val_idx = train_test_split(
+                np.arange(X_all_tfidf.shape[0]), test_size=0.2, random_state=42
+            )
+            train_df, val_df = lyrics_df.iloc[train_idx], lyrics_df.iloc[val_idx]
+            X_train_tfidf, X_val_tfidf = X_all_tfidf[train_idx], X_all_tfidf[val_idx]
+            logger.info(f"📊 Train: {len(train_df)}, Validation: {len(val_df)}")
             
             logger.info(f"📊 TF-IDF shape: {X_train_tfidf.shape}")
             
@@ -506,13 +778,17 @@ class ModelPipeline:
                 
                 try:
                     if config['model_class'] == 'custom':  # SVD + KNN
-                        # Train SVD
+                        # Train SVD; randomized SVD is O(nnz·k) on the sparse TF-IDF matrix
                         svd_model = TruncatedSVD(
                             n_components=config['params']['n_components'],
+                            algorithm='randomized',
+                            n_iter=4,
                             random_state=42
                         )
-                        X_train_reduced = svd_model.fit_transform(X_train_tfidf)
-                        X_val_reduced = svd_model.transform(X_val_tfidf)
+                        X_train_reduced = svd_model.fit_transform(X_train_tfidf).astype(np.float32, copy=False)
+                        # float32 components keep query-time transforms in float32
+                        svd_model.components_ = svd_model.components_.astype(np.float32, copy=False)
+                        X_val_reduced = svd_model.transform(X_val_tfidf).astype(np.float32, copy=False)
                         
                         logger.info(f"📊 SVD explained variance: {svd_model.explained_variance_ratio_.sum():.4f}")
                         
@@ -538,6 +814,22 @@ class ModelPipeline:
                         joblib.dump(svd_model, svd_path)
                         joblib.dump(knn_model, knn_path)
                         
+                        # FAISS inner-product index over unit-norm vectors gives cosine
+                        # top-k; the one index serves both the backend lyrics service
+                        # and the generated production search module
+                        if faiss is not None:
+                            X_unit = np.array(X_train_reduced, dtype=np.float32, order='C')
+                            faiss.normalize_L2(X_unit)
+                            if X_unit.shape[0] > LYRICS_FAISS_HNSW_MIN:
+                                faiss_index = faiss.IndexHNSWFlat(X_unit.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+                            else:
+                                faiss_index = faiss.IndexFlatIP(X_unit.shape[1])
+                            faiss_index.add(X_unit)
+                            
+                            faiss_filename = f"lyrics_faiss_index_{model_name}.faiss"
+                            faiss.write_index(faiss_index, str(self.models_dir / faiss_filename))
+                            trained_models[model_name]['faiss_index'] = faiss_filename
+                        
                     else:  # Regular KNN models
                         model = config['model_class'](**config['params'])
                         model.fit(X_train_tfidf)
@@ -558,12 +850,11 @@ class ModelPipeline:
                         'description': config['description'],
                         'sklearn_version': joblib.__version__,
                         'has_svd': config['model_class'] == 'custom',
+                        'faiss_index': trained_models[model_name].get('faiss_index'),
                         'created_at': datetime.now().isoformat()
                     }
                     
-                    config_path = self.models_dir / f"lyrics_config_{model_name}.json"
-                    with open(config_path, 'w') as f:
-                        json.dump(config_data, f, indent=2)
+                    self._write_json(f"lyrics_config_{model_name}.json", config_data)
                     
                     logger.info(f"✅ {model_name} model trained and saved")
                     
@@ -575,22 +866,33 @@ class ModelPipeline:
             vectorizer_path = self.models_dir / "lyrics_tfidf_vectorizer.pkl"
             joblib.dump(vectorizer, vectorizer_path)
             
+            # Training TF-IDF rows are already unit-norm, so cosine search can be a
+            # single sparse dot product against this matrix. Raw .npy buffers let
+            # the search module memory-map them; the CSC copy is its inverted index
+            X_train_csr = X_train_tfidf.tocsr()
+            X_train_csc = X_train_csr.tocsc()
+            tfidf_arrays = {
+                'lyrics_tfidf_matrix_data.npy': X_train_csr.data,
+                'lyrics_tfidf_matrix_indices.npy': X_train_csr.indices,
+                'lyrics_tfidf_matrix_indptr.npy': X_train_csr.indptr,
+                'lyrics_tfidf_postings_indices.npy': X_train_csc.indices,
+                'lyrics_tfidf_postings_indptr.npy': X_train_csc.indptr
+            }
+            for filename, array in tfidf_arrays.items():
+                np.save(self.models_dir / filename, array, allow_pickle=False)
+            
             # Save training metadata
             training_metadata = {
                 'training_date': datetime.now().isoformat(),
                 'n_training_songs': len(train_df),
                 'n_validation_songs': len(val_df),
-                'vocabulary_size': len(vectorizer.vocabulary_),
+                'vocabulary_size': vocabulary_size,
                 'tfidf_features': X_train_tfidf.shape[1],
                 'preprocessing': 'lemmatization + stop_words',
-                'training_songs': [
-                    {
-                        'id': row['id'],
-                        'name': row['name'],
-                        'artists_id': row['artists_id']
-                    }
-                    for _, row in train_df.iterrows()
-                ]
+                # Parallel arrays, one entry per training row, indexed by KNN results
+                'ids': np.asarray(train_df['id'].values, dtype=str),
+                'names': train_df['name'].to_numpy(dtype=object),
+                'artists': train_df['artists_id'].to_numpy(dtype=object)
             }
             
             metadata_path = self.models_dir / "lyrics_training_metadata.pkl"
@@ -605,13 +907,11 @@ class ModelPipeline:
                     'total_songs_with_lyrics': len(lyrics_df),
                     'training_size': len(train_df),
                     'validation_size': len(val_df),
-                    'vocabulary_size': len(vectorizer.vocabulary_)
+                    'vocabulary_size': vocabulary_size
                 }
             }
             
-            results_path = self.models_dir / "lyrics_model_evaluation_results.json"
-            with open(results_path, 'w') as f:
-                json.dump(evaluation_summary, f, indent=2)
+            self._write_json("lyrics_model_evaluation_results.json", evaluation_summary)
             
             # Create production function
             self._create_lyrics_production_function(list(trained_models.keys())[0] if trained_models else 'knn_cosine')
@@ -632,58 +932,151 @@ Production-ready lyrics similarity search function
 Generated automatically by model pipeline
 """
 
+import os
 import pandas as pd
 import numpy as np
 import joblib
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
+from functools import lru_cache
+from multiprocessing import Pool
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
 
-# Initialize NLTK components
+# Optional FAISS index for the SVD model's dense embeddings
 try:
+    import faiss
+except ImportError:
+    faiss = None
+
+@lru_cache(maxsize=1)
+def _nlp():
+    """Load the NLTK lemmatizer and stop words on first use"""
+    # Deferred so importing this module stays cheap; the corpora are expected
+    # to be installed ahead of time (python -m nltk.downloader stopwords wordnet)
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    
     lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words('english'))
-except:
-    print("Warning: NLTK data not available. Please run: nltk.download(['punkt', 'stopwords', 'wordnet'])")
+    stop_words = frozenset(stopwords.words('english'))
+    # Lyrics reuse a small vocabulary, so most lemma lookups are repeats
+    return lru_cache(maxsize=50_000)(lemmatizer.lemmatize), stop_words
+
+# Cleaning patterns, compiled once at import
+_NON_ALPHA_RE = re.compile(r'[^a-z\\s]')
+
+# Batches at least this large are preprocessed across all cores
+PARALLEL_PREPROCESS_MIN = 10_000
+PREPROCESS_CHUNKSIZE = 2000
 
 # Load model components (update paths as needed)
 MODEL_DIR = "../../data/models"
 vectorizer = joblib.load(f"{{MODEL_DIR}}/lyrics_tfidf_vectorizer.pkl")
 training_metadata = joblib.load(f"{{MODEL_DIR}}/lyrics_training_metadata.pkl")
+song_ids = training_metadata['ids']
+song_names = training_metadata['names']
+song_artists = training_metadata['artists']
 
 # Load best model: {best_model_name}
+model_type = None
+faiss_index = None
 try:
+    # The query path (vectorizer -> [svd ->] knn) is assembled from the saved
+    # parts rather than pickled again as a whole
     if "{best_model_name}" == "svd_knn":
-        svd_model = joblib.load(f"{{MODEL_DIR}}/lyrics_svd_model_{best_model_name}.pkl")
-        similarity_model = joblib.load(f"{{MODEL_DIR}}/lyrics_knn_model_{best_model_name}.pkl")
-        model_type = "svd_knn"
+        query_steps = [
+            ('svd', joblib.load(f"{{MODEL_DIR}}/lyrics_svd_model_{best_model_name}.pkl", mmap_mode='r')),
+            ('knn', joblib.load(f"{{MODEL_DIR}}/lyrics_knn_model_{best_model_name}.pkl", mmap_mode='r'))
+        ]
     else:
-        similarity_model = joblib.load(f"{{MODEL_DIR}}/lyrics_similarity_model_{best_model_name}.pkl")
-        model_type = "knn"
-        svd_model = None
+        query_steps = [('knn', joblib.load(f"{{MODEL_DIR}}/lyrics_similarity_model_{best_model_name}.pkl", mmap_mode='r'))]
+    query_pipeline = Pipeline([('tfidf', vectorizer)] + query_steps)
+    
+    # Every step but the KNN turns text into query vectors
+    query_transform = query_pipeline[:-1]
+    similarity_model = query_pipeline.named_steps['knn']
+    model_type = "svd_knn" if 'svd' in query_pipeline.named_steps else "knn"
+    
+    faiss_path = f"{{MODEL_DIR}}/lyrics_faiss_index_{best_model_name}.faiss"
+    if model_type == "svd_knn" and faiss is not None and os.path.exists(faiss_path):
+        faiss_index = faiss.read_index(faiss_path)
+        if hasattr(faiss_index, 'hnsw'):
+            faiss_index.hnsw.efSearch = 64
 except Exception as e:
     print(f"Error loading model: {{e}}")
     similarity_model = None
 
+def _load_array(name):
+    """Memory-map a raw training array; pages are read only as searches touch them"""
+    return np.load(f"{{MODEL_DIR}}/{{name}}.npy", mmap_mode='r')
+
+# Unit-norm training TF-IDF rows; with them cosine top-k is one sparse product.
+# The postings arrays are the CSC layout of the same matrix: entries
+# postings_indptr[j]:postings_indptr[j + 1] of postings_indices are the rows
+# containing term j
+try:
+    tfidf_indptr = _load_array("lyrics_tfidf_matrix_indptr")
+    tfidf_matrix = sp.csr_matrix(
+        (_load_array("lyrics_tfidf_matrix_data"), _load_array("lyrics_tfidf_matrix_indices"), tfidf_indptr),
+        shape=(len(tfidf_indptr) - 1, training_metadata['tfidf_features'])
+    )
+    postings_indices = _load_array("lyrics_tfidf_postings_indices")
+    postings_indptr = _load_array("lyrics_tfidf_postings_indptr")
+except Exception:
+    tfidf_matrix = None
+use_dot_product = (
+    model_type == "knn" and tfidf_matrix is not None
+    and getattr(similarity_model, 'metric', None) == 'cosine'
+)
+
+def _cosine_kneighbors(query_vectors, k):
+    """Top-k cosine neighbours of unit-norm query rows, as (distances, indices)
+    
+    Rows sharing no term with a query have zero similarity, so only the union
+    of the query terms' posting lists is scored.
+    """
+    n_rows = tfidf_matrix.shape[0]
+    k = min(k, n_rows)
+    distances = np.empty((query_vectors.shape[0], k))
+    indices = np.empty((query_vectors.shape[0], k), dtype=np.intp)
+    
+    for row in range(query_vectors.shape[0]):
+        query = query_vectors[row]
+        postings = [
+            postings_indices[postings_indptr[j]:postings_indptr[j + 1]]
+            for j in query.indices
+        ]
+        candidates = np.unique(np.concatenate(postings)) if postings else np.empty(0, dtype=np.intp)
+        if len(candidates) < k:
+            # Too few overlapping rows to fill k; score everything like kneighbors does
+            candidates = np.arange(n_rows)
+        
+        sims = (tfidf_matrix[candidates] @ query.T).toarray().ravel()
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        indices[row] = candidates[top]
+        distances[row] = 1 - sims[top]
+    
+    return distances, indices
+
+@lru_cache(maxsize=131072)
 def preprocess_lyrics(text):
     """Preprocess lyrics using the same method as training"""
-    if pd.isna(text):
+    # Nothing shorter than 3 characters can yield a kept token
+    if not isinstance(text, str) or len(text) < 3:
         return ""
     
-    # Convert to lowercase and clean
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z\\s]', '', text)
-    text = re.sub(r'\\s+', ' ', text)
-    text = text.strip()
+    # Convert to lowercase and clean, unless the text is already lowercase
+    # ASCII letters and spaces (e.g. previously processed lyrics)
+    if not (text.isascii() and text.islower() and text.replace(' ', '').isalpha()):
+        text = _NON_ALPHA_RE.sub('', text.lower())
     
-    # Tokenize
-    tokens = word_tokenize(text)
+    lemmatize, stop_words = _nlp()
     
-    # Apply preprocessing
-    processed_tokens = [lemmatizer.lemmatize(token) for token in tokens 
-                       if token not in stop_words and len(token) > 2]
+    # Tokenize (the text is already reduced to [a-z ], so a whitespace split is
+    # enough and also collapses repeated spaces) and filter in one pass; the
+    # length test is cheaper than the set lookup
+    processed_tokens = [lemmatize(token) for token in text.split()
+                       if len(token) > 2 and token not in stop_words]
     
     return ' '.join(processed_tokens)
 
@@ -700,39 +1093,91 @@ def find_similar_songs_by_lyrics(lyrics_text, k=10):
     """
     if similarity_model is None:
         return []
-        
-    # Preprocess the input lyrics
-    processed_lyrics = preprocess_lyrics(lyrics_text)
     
+    processed_lyrics = preprocess_lyrics(lyrics_text)
     if not processed_lyrics:
         return []
     
-    # Vectorize the lyrics
-    lyrics_vector = vectorizer.transform([processed_lyrics])
+    return [dict(song) for song in _cached_search(processed_lyrics, k)]
+
+@lru_cache(maxsize=4096)
+def _cached_search(processed_lyrics, k):
+    """Search for one preprocessed query; results are frozen so cache hits can't be mutated"""
+    results = _search_processed([processed_lyrics], k)[0]
+    return tuple(tuple(song.items()) for song in results)
+
+def find_similar_songs_by_lyrics_batch(lyrics_texts, k=10):
+    """
+    Find similar songs for many lyrics queries at once
     
-    # Apply SVD if needed
-    if model_type == "svd_knn" and svd_model is not None:
-        lyrics_vector = svd_model.transform(lyrics_vector)
+    All queries share one TF-IDF transform and one kneighbors call.
+    
+    Args:
+        lyrics_texts (list): Lyrics texts to find similar songs for
+        k (int): Number of similar songs to return per query
+    
+    Returns:
+        list: One list of similar songs per input text, in input order
+    """
+    if similarity_model is None:
+        return [[] for _ in lyrics_texts]
+        
+    # Preprocess the input lyrics
+    if len(lyrics_texts) >= PARALLEL_PREPROCESS_MIN:
+        with Pool(os.cpu_count()) as pool:
+            processed = pool.map(preprocess_lyrics, lyrics_texts, chunksize=PREPROCESS_CHUNKSIZE)
+    else:
+        processed = [preprocess_lyrics(text) for text in lyrics_texts]
+    
+    return _search_processed(processed, k)
+
+def _search_processed(processed, k):
+    """Vectorize preprocessed queries and return one result list per query"""
+    batch_results = [[] for _ in processed]
+    positions = [i for i, text in enumerate(processed) if text]
+    
+    if not positions:
+        return batch_results
+    
+    # Vectorize the lyrics (and reduce them for SVD models); float32 halves the
+    # bytes moved by the search below (a no-op for models trained in float32)
+    lyrics_vectors = query_transform.transform([processed[i] for i in positions]).astype(np.float32, copy=False)
     
     # Find similar songs
-    distances, indices = similarity_model.kneighbors(lyrics_vector, n_neighbors=k)
+    if model_type == "svd_knn" and faiss_index is not None:
+        # Inner product of unit vectors is cosine similarity
+        lyrics_vectors = np.ascontiguousarray(lyrics_vectors)
+        faiss.normalize_L2(lyrics_vectors)
+        sims, indices = faiss_index.search(lyrics_vectors, k)
+        distances = 1 - sims
+    elif use_dot_product:
+        distances, indices = _cosine_kneighbors(lyrics_vectors, k)
+    else:
+        distances, indices = similarity_model.kneighbors(lyrics_vectors, n_neighbors=k)
     
     # Format results
-    results = []
-    for idx, distance in zip(indices[0], distances[0]):
-        if idx < len(training_metadata['training_songs']):
-            song_info = training_metadata['training_songs'][idx]
-            results.append({{
-                'track_id': song_info['id'],
-                'name': song_info['name'],
-                'artist': song_info['artists_id'],
-                'similarity_score': float(1 - distance)  # Convert distance to similarity
-            }})
-    
-    return results
+    for row, position in enumerate(positions):
+        # FAISS pads missing neighbours with -1
+        valid = (indices[row] >= 0) & (indices[row] < len(song_ids))
+        hit_indices = indices[row][valid]
+        similarities = 1 - distances[row][valid]  # Convert distance to similarity
+        batch_results[position] = [
+            {{
+                'track_id': str(track_id),
+                'name': name,
+                'artist': artist,
+                'similarity_score': float(similarity)
+            }}
+            for track_id, name, artist, similarity in zip(
+                song_ids[hit_indices], song_names[hit_indices], song_artists[hit_indices], similarities
+            )
+        ]
+    
+    return batch_results
 
 # Example usage:
 # recommendations = find_similar_songs_by_lyrics("your lyrics here", k=5)
+# batch_recommendations = find_similar_songs_by_lyrics_batch(["first lyrics", "second lyrics"], k=5)
 '''
         
         function_path = self.models_dir / "lyrics_similarity_search_production.py"
@@ -753,17 +1198,21 @@ def find_similar_songs_by_lyrics(lyrics_text, k=10):
         
         results = {}
         
-        # Generate HDBSCAN models
-        logger.info("=" * 60)
-        logger.info("🎯 PHASE 1: HDBSCAN Clustering Models")
-        logger.info("=" * 60)
-        results['hdbscan_models'] = self.generate_hdbscan_models(df, force_regenerate)
+        # The two phases read disjoint columns and write disjoint artifacts, so
+        # run them side by side; each worker only gets the columns it needs.
+        # forkserver rather than fork: load_spotify_data has already started
+        # pyarrow's thread pool in this process, and forking threads is unsafe
+        hdbscan_cols = [col for col in ['id', 'name', 'artists_id', 'uri', *BASIC_AUDIO_FEATURES] if col in df.columns]
+        lyrics_cols = [col for col in ['id', 'name', 'artists_id', 'lyrics'] if col in df.columns]
         
-        # Generate Lyrics models
         logger.info("=" * 60)
-        logger.info("🎯 PHASE 2: Lyrics Similarity Models")
+        logger.info("🎯 PHASE 1 + 2: HDBSCAN Clustering and Lyrics Similarity Models (concurrent)")
         logger.info("=" * 60)
-        results['lyrics_models'] = self.generate_lyrics_models(df, force_regenerate)
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('forkserver')) as executor:
+            hdbscan_future = executor.submit(self.generate_hdbscan_models, df[hdbscan_cols], force_regenerate)
+            lyrics_future = executor.submit(self.generate_lyrics_models, df[lyrics_cols], force_regenerate)
+            results['hdbscan_models'] = hdbscan_future.result()
+            results['lyrics_models'] = lyrics_future.result()
         
         # Summary
         logger.info("=" * 60)
@@ -803,13 +1252,16 @@ def find_similar_songs_by_lyrics(lyrics_text, k=10):
         
         status = {}
         
+        # One directory listing answers every existence check below
+        existing = set(os.listdir(self.models_dir)) if self.models_dir.exists() else set()
+        
         for model_type, info in model_types.items():
             model_status = {
                 'generated': False,
                 'variants': {},
                 'base_files': {},
-                'success_marker': (self.models_dir / f".{model_type}_success").exists(),
-                'failure_marker': (self.models_dir / f".{model_type}_failed").exists()
+                'success_marker': f".{model_type}_success" in existing,
+                'failure_marker': f".{model_type}_failed" in existing
             }
             
             # Check variant files
@@ -821,7 +1273,7 @@ def find_similar_songs_by_lyrics(lyrics_text, k=10):
                         f"{variant}_audio_embeddings.pkl",
                         f"hdbscan_config_{variant}.json"
                     ]
-                    variant_exists = all((self.models_dir / f).exists() for f in variant_files)
+                    variant_exists = all(f in existing for f in variant_files)
                     model_status['variants'][variant] = variant_exists
                     
             elif model_type == 'lyrics_models':
@@ -837,12 +1289,12 @@ def find_similar_songs_by_lyrics(lyrics_text, k=10):
                             f"lyrics_similarity_model_{variant}.pkl",
                             f"lyrics_config_{variant}.json"
                         ]
-                    variant_exists = all((self.models_dir / f).exists() for f in variant_files)
+                    variant_exists = all(f in existing for f in variant_files)
                     model_status['variants'][variant] = variant_exists
             
             # Check base files
             for base_file in info['base_files']:
-                model_status['base_files'][base_file] = (self.models_dir / base_file).exists()
+                model_status['base_files'][base_file] = base_file in existing
             
             # Overall status
             model_status['generated'] = (
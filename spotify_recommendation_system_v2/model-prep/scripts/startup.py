@@ -74,8 +74,15 @@ def check_existing_models():
         logger.info("📂 Models directory doesn't exist yet")
         return False
     
-    pkl_files = list(models_path.glob("*.pkl"))
-    json_files = list(models_path.glob("*.json"))
+    # Single directory scan; entries carry their names, so no per-file stat is needed
+    pkl_files = []
+    json_files = []
+    with os.scandir(models_path) as entries:
+        for entry in entries:
+            if entry.name.endswith('.pkl'):
+                pkl_files.append(Path(entry.path))
+            elif entry.name.endswith('.json'):
+                json_files.append(Path(entry.path))
     
     if pkl_files or json_files:
         logger.info(f"📊 Found existing files:")
@@ -139,7 +146,7 @@ def main():
         
         # Import and run pipeline
         logger.info("🔧 Starting model generation pipeline...")
-        from model_pipeline import main as run_pipeline
+        from model_pipeline import main as run_pipeline, atomic_write
         
         start_time = time.time()
         run_pipeline()
@@ -160,7 +167,7 @@ def main():
                 'duration_seconds': duration,
                 'force_mode': args.force
             }
-            success_marker.write_text(f"Success at {time.ctime()}\nDuration: {duration:.2f}s\nForce: {args.force}")
+            atomic_write(success_marker, f"Success at {time.ctime()}\nDuration: {duration:.2f}s\nForce: {args.force}")
         else:
             logger.error("❌ Model generation completed but no models found!")
             sys.exit(1)
@@ -173,7 +180,15 @@ def main():
         
         # Create failure marker
         failure_marker = Path("/tmp/model_prep_failure")
-        failure_marker.write_text(f"Failed at {time.ctime()}\nError: {str(e)}")
+        failure_text = f"Failed at {time.ctime()}\nError: {str(e)}"
+        try:
+            from model_pipeline import atomic_write
+        except Exception:
+            # The pipeline module itself failed to import; a plain write still
+            # leaves the marker the healthcheck looks for
+            failure_marker.write_text(failure_text)
+        else:
+            atomic_write(failure_marker, failure_text)
         
         sys.exit(1)
 